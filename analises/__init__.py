@@ -0,0 +1 @@
+"""Estudos que reutilizam os solvers de fluxo de carga (séries temporais, contingências, ...)"""
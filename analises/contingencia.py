@@ -0,0 +1,127 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import csv  # Importa o módulo csv para gravar a tabela de violações
+import os  # Importa o módulo os para consultar o número de processadores
+import time  # Importa o módulo time para medir o tempo de execução
+from concurrent.futures import ProcessPoolExecutor  # Pool de processos para as contingências
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from comum.barras import S_BASE, bus_arrays  # Vetores das barras e potência base
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.fluxos import branch_flows  # Fluxos vetorizados nos ramos
+from comum.ybus import branch_admittances, branch_arrays  # Modelo π dos ramos
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+COLUNAS = ('ramo', 'de', 'para', 'violacao', 'elemento', 'valor', 'limite')  # Colunas da tabela de violações
+TOLERANCIA = 1e-6  # Tolerância do Newton-Raphson
+
+_contexto = {}  # Estado de cada processo de trabalho
+
+def entry_positions(Ybus, linhas, colunas):
+    """Posições em Ybus.data dos elementos (linhas[i], colunas[i]) de uma matriz CSR canônica"""
+    n = Ybus.shape[0]  # Número de barras
+    chaves = np.repeat(np.arange(n, dtype=np.int64), np.diff(Ybus.indptr)) * n + Ybus.indices  # Chave linear ordenada de cada elemento
+    pos = np.searchsorted(chaves, np.asarray(linhas, dtype=np.int64) * n + colunas)  # Busca binária das chaves pedidas
+    return pos
+
+def _init_worker(Ybus, barras, ramos, V_base, vmin, vmax):
+    """Prepara um processo: cópia de trabalho da Ybus e posições de cada ramo na matriz"""
+    Ybus = Ybus.copy()  # Cópia própria, alterada e restaurada a cada contingência
+    Ybus.sort_indices()  # Forma canônica para a busca das posições
+    de, para = ramos['de'], ramos['para']
+    yff, yft, ytf, ytt = branch_admittances(ramos)  # Contribuições de cada ramo
+    _contexto.update(
+        Ybus=Ybus, barras=barras, ramos=ramos, V_base=V_base, vmin=vmin, vmax=vmax,
+        adm=(yff, yft, ytf, ytt),
+        # Posições (DE,DE), (DE,PARA), (PARA,DE), (PARA,PARA) de cada ramo em Ybus.data
+        pos=np.stack([entry_positions(Ybus, de, de), entry_positions(Ybus, de, para),
+                      entry_positions(Ybus, para, de), entry_positions(Ybus, para, para)], axis=1)
+    )
+
+def _violations(k, V):
+    """Violações de tensão (só barras PQ) e de carregamento após a saída do ramo k"""
+    ramos = _contexto['ramos']
+    saida = []  # Linhas da tabela de violações
+    modulo = np.abs(V)  # Módulos de tensão
+    pq = _contexto['barras']['tipo'] == 0  # Slack e PV mantêm a tensão especificada, fora da faixa por projeto
+    for i in np.flatnonzero(pq & (modulo < _contexto['vmin'])):
+        saida.append(('subtensao', i + 1, modulo[i], _contexto['vmin']))
+    for i in np.flatnonzero(pq & (modulo > _contexto['vmax'])):
+        saida.append(('sobretensao', i + 1, modulo[i], _contexto['vmax']))
+    S_de, S_para = branch_flows(V, ramos, _contexto['adm'])  # Fluxos nos dois extremos de cada ramo
+    carregamento = np.maximum(np.abs(S_de), np.abs(S_para)) * S_BASE  # Maior fluxo aparente (MVA)
+    carregamento[k] = 0  # Ramo desligado
+    for j in np.flatnonzero(carregamento > ramos['limite']):
+        saida.append(('sobrecarga', j + 1, carregamento[j], ramos['limite'][j]))
+    return saida
+
+def _solve_outages(indices):
+    """Resolve as contingências de um bloco, retirando cada ramo da Ybus por atualização de posto baixo"""
+    Ybus, pos = _contexto['Ybus'], _contexto['pos']
+    ramos = _contexto['ramos']
+    tabela = []  # Linhas da tabela de violações do bloco
+    for k in indices:
+        originais = Ybus.data[pos[k]].copy()  # Valores a restaurar
+        Ybus.data[pos[k]] -= [a[k] for a in _contexto['adm']]  # Retira o ramo k (só os 4 elementos afetados)
+        try:
+            V, _, erro = newton_raphson_power_flow(Ybus, _contexto['barras'], tol=TOLERANCIA, V0=_contexto['V_base'],
+                                                   limites=None)  # Tensões livres: subtensão real não vira divergência
+            violacoes = _violations(k, V) if erro < TOLERANCIA else [('nao_convergiu', k + 1, erro, TOLERANCIA)]
+        except RuntimeError:  # Jacobiana singular (ex.: ilhamento de barras)
+            violacoes = [('nao_convergiu', k + 1, np.inf, TOLERANCIA)]
+        finally:
+            Ybus.data[pos[k]] = originais  # Restaura o caso base
+        tabela.extend((k + 1, ramos['de'][k] + 1, ramos['para'][k] + 1) + v for v in violacoes)
+    return tabela
+
+def run_contingencies(Ybus, bus_data, impedancias, ramos_fora=None, vmin=0.95, vmax=1.05, processos=None):
+    """Análise N-1: retira cada ramo (ou os ramos de ramos_fora, base zero) e resolve o fluxo de carga
+
+    Cada contingência parte das tensões do caso base; os ramos são distribuídos entre processos.
+    Retorna a tabela de violações como dicionário de colunas (ver COLUNAS).
+    """
+    barras = bus_arrays(bus_data)  # Vetores das barras
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    Ybus = Ybus.tocsr()  # Garante o formato CSR
+    V_base, _, erro = newton_raphson_power_flow(Ybus, barras, tol=TOLERANCIA, limites=None)  # Caso base
+    if erro >= TOLERANCIA:
+        raise RuntimeError(f"O caso base não convergiu (erro {erro:.3e})")
+    indices = np.arange(len(ramos['de'])) if ramos_fora is None else np.asarray(ramos_fora)  # Contingências
+    processos = processos or os.cpu_count() or 1  # Número de processos
+    blocos = np.array_split(indices, min(4 * processos, max(len(indices), 1)))  # Blocos de contingências
+    args = (Ybus, barras, ramos, V_base, vmin, vmax)
+    if processos == 1:
+        _init_worker(*args)
+        partes = [_solve_outages(b) for b in blocos]
+    else:
+        with ProcessPoolExecutor(processos, initializer=_init_worker, initargs=args) as pool:
+            partes = list(pool.map(_solve_outages, blocos))
+    linhas = [linha for parte in partes for linha in parte]
+    return {c: np.array([linha[i] for linha in linhas]) for i, c in enumerate(COLUNAS)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise de contingências N-1 de ramos")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos (LIMITE (MVA) opcional)")
+    parser.add_argument("--vmin", type=float, default=0.95, help="Tensão mínima (pu)")
+    parser.add_argument("--vmax", type=float, default=1.05, help="Tensão máxima (pu)")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("--saida", default="violacoes.csv", help="Arquivo CSV da tabela de violações")
+    args = parser.parse_args()
+
+    try:
+        caso = load_case(args.barras, args.impedancias)  # Caso compilado (barras, ramos e Ybus)
+    except Exception as e:
+        print(f"\nErro: {e}")
+        return
+    start_time = time.time()  # Marca o tempo inicial
+    tabela = run_contingencies(caso['Ybus'], caso['barras'], caso['ramos'], vmin=args.vmin, vmax=args.vmax, processos=args.processos)
+    print(f"\n{len(caso['ramos']['de'])} contingências analisadas em {time.time() - start_time:.2f} segundos")
+    with open(args.saida, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(COLUNAS)
+        escritor.writerows(zip(*(tabela[c] for c in COLUNAS)))
+    for tipo in ('nao_convergiu', 'sobrecarga', 'subtensao', 'sobretensao'):
+        print(f"{tipo}: {int(np.sum(tabela['violacao'] == tipo)) if len(tabela['violacao']) else 0}")
+    print(f"Tabela de violações salva em {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import time  # Importa o módulo time para medir o tempo de execução
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from comum.barras import S_BASE, bus_arrays  # Vetores das barras e potência base
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.newton import build_jacobian, factorize, mismatch  # Resíduos, Jacobiana e fatoração esparsa
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+TOLERANCIA = 1e-6  # Tolerância dos resíduos de potência (pu)
+
+def load_direction(barras, geracao=True):
+    """Direção de crescimento das injeções (pu por unidade de λ): cargas proporcionais ao caso base
+
+    Com geracao=True as barras PV também aumentam a geração ativa na mesma proporção, em vez de a slack
+    assumir todo o acréscimo.
+    """
+    direcao = -(barras['p_carga'] + 1j * barras['q_carga'])  # Acréscimo de carga com fator de potência constante
+    if geracao:
+        pv = barras['tipo'] == 2
+        direcao[pv] += barras['p'][pv] + barras['p_carga'][pv]  # Geração ativa das barras PV
+    return direcao
+
+def _augmented(Ybus, Vc, var_theta, PQ_idx, d, k):
+    """Jacobiana aumentada [J -d; e_k^T]: a última linha fixa a variável de continuação k (λ é a última)"""
+    J = build_jacobian(Ybus, Vc, var_theta, PQ_idx)
+    m = J.shape[0]
+    e_k = sparse.csr_matrix(([1.0], ([0], [k])), shape=(1, m + 1))
+    return sparse.vstack([sparse.hstack([J, sparse.csc_matrix(-d[:, None])]), e_k], format="csc")
+
+def continuation_power_flow(Ybus, bus_data, direcao=None, passo=0.1, passo_min=1e-4, passo_max=5.0, tol_nariz=1e-3,
+                            max_pontos=500, max_corretor=10, ate_nariz=False, tol=TOLERANCIA):
+    """Fluxo de carga continuado: traça a curva PV com preditor tangente, corretor com parametrização local e passo adaptativo
+
+    As injeções são S(λ) = S_base + λ·direcao (padrão: load_direction). A variável de continuação é a
+    componente de maior módulo da tangente (λ longe do nariz, uma tensão perto dele), o que mantém a
+    Jacobiana aumentada não singular no ponto de máximo carregamento. O passo cresce quando o corretor
+    converge rápido, cai à metade quando falha e é refinado até tol_nariz quando a tangente muda o sentido de λ.
+    Para ao voltar a λ <= 0 (curva completa) ou logo após o nariz com ate_nariz=True.
+    Retorna pontos λ e tensões (pontos x barras), o máximo carregamento, a barra crítica e a contagem de fatorações.
+    """
+    Ybus = Ybus.tocsr()  # Garante o formato CSR
+    barras = bus_arrays(bus_data)  # Vetores das barras em pu
+    tipo = barras['tipo']
+    PQ_idx = np.flatnonzero(tipo == 0)
+    var_theta = np.concatenate([PQ_idx, np.flatnonzero(tipo == 2)])
+    n_theta, m = len(var_theta), len(var_theta) + len(PQ_idx)
+    S_base = barras['p'] + 1j * barras['q']  # Injeções do caso base
+    direcao = load_direction(barras) if direcao is None else np.asarray(direcao, dtype=complex)
+    d = np.concatenate([direcao.real[var_theta], direcao.imag[PQ_idx]])  # ∂(resíduo)/∂λ
+    V0, it_base, erro = newton_raphson_power_flow(Ybus, barras, tol=tol)  # Caso base (λ = 0)
+    if erro >= tol:
+        raise RuntimeError(f"O caso base não convergiu (erro {erro:.3e})")
+    fatoracoes = it_base  # Uma fatoração por iteração do caso base
+    Vm, Va = np.abs(V0), np.angle(V0)
+
+    def tensoes(z):  # Tensões complexas do estado z = [θ(pvpq); |V|(pq); λ]
+        Va_z, Vm_z = Va.copy(), Vm.copy()
+        Va_z[var_theta], Vm_z[PQ_idx] = z[:n_theta], z[n_theta:m]
+        return Vm_z * np.exp(1j * Va_z)
+
+    def tangente(lu, anterior):  # Tangente unitária a partir da Jacobiana aumentada fatorada, orientada como a anterior
+        e = np.zeros(m + 1)
+        e[-1] = 1.0
+        t = lu.solve(e)  # [J -d] t = 0: a direção não depende da variável fixada na última linha
+        t /= np.linalg.norm(t)
+        if anterior is not None and t @ anterior < 0:
+            t = -t
+        return t
+
+    z = np.concatenate([Va[var_theta], Vm[PQ_idx], [0.0]])
+    k = m  # Começa parametrizado por λ
+    t = tangente(factorize(_augmented(Ybus, V0, var_theta, PQ_idx, d, k)), None)
+    fatoracoes += 1
+    if t[-1] < 0:
+        t = -t  # Sentido de carregamento crescente
+    lambdas, curvas = [0.0], [V0]
+    critica = PQ_idx[np.argmax(np.abs(t[n_theta:m]))] if len(PQ_idx) else 0  # Barra PQ de maior sensibilidade dV/dλ
+    passou_nariz = False
+    while len(lambdas) < max_pontos:
+        alvo = z + passo * t  # Preditor tangente
+        z_novo, convergiu, lu = alvo.copy(), False, None
+        for it_corretor in range(max_corretor):  # Corretor com a variável k fixa no valor predito
+            Vc = tensoes(z_novo)
+            residuo = mismatch(Ybus, Vc, S_base + z_novo[-1] * direcao, var_theta, PQ_idx)
+            if np.max(np.abs(residuo)) < tol:
+                convergiu = np.all(np.isfinite(z_novo))
+                break
+            lu = factorize(_augmented(Ybus, Vc, var_theta, PQ_idx, d, k))
+            fatoracoes += 1
+            z_novo += lu.solve(np.append(residuo, 0.0))
+            if not np.all(np.isfinite(z_novo)):
+                break
+        if not convergiu:
+            passo /= 2  # Corretor falhou: passo menor
+            if passo < passo_min:
+                break
+            continue
+        if lu is None:  # Preditor já convergido: fatora no ponto
+            lu = factorize(_augmented(Ybus, tensoes(z_novo), var_theta, PQ_idx, d, k))
+            fatoracoes += 1
+        t_novo = tangente(lu, t)  # Reaproveita a última fatoração do corretor (a uma correção do ponto)
+        if not passou_nariz and t_novo[-1] < 0 < t[-1] and passo > tol_nariz:
+            passo /= 2  # O nariz está dentro do passo: refina antes de atravessá-lo
+            continue
+        passou_nariz = passou_nariz or t_novo[-1] < 0
+        z, t = z_novo, t_novo
+        if z[-1] > max(lambdas) and len(PQ_idx):
+            critica = PQ_idx[np.argmax(np.abs(t[n_theta:m]))]  # Componente de tensão dominante da tangente
+        lambdas.append(z[-1])
+        curvas.append(tensoes(z))
+        if passou_nariz and (ate_nariz or z[-1] <= 0):
+            break
+        k = int(np.argmax(np.abs(t)))  # Parametrização local: maior componente da tangente
+        if it_corretor <= 2:
+            passo = min(passo * 1.5, passo_max)  # Convergência rápida: passo maior
+        elif it_corretor >= 5:
+            passo = max(passo / 2, passo_min)
+    lambdas, curvas = np.array(lambdas), np.array(curvas)
+    nariz = int(np.argmax(lambdas))
+    return {
+        'lambda': lambdas,  # Fator de carregamento de cada ponto
+        'V': curvas,  # Tensões complexas (pontos x barras)
+        'lambda_max': float(lambdas[nariz]),  # Máximo carregamento (margem de estabilidade de tensão)
+        'V_nariz': curvas[nariz],  # Tensões no ponto de máximo carregamento
+        'barra_critica': int(critica),  # Barra de maior dV/dλ junto ao nariz (base zero)
+        'passou_nariz': bool(passou_nariz),
+        'fatoracoes': int(fatoracoes),  # Fatorações LU (cada uma seguida de uma substituição)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Fluxo de carga continuado: curvas PV e máximo carregamento")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos")
+    parser.add_argument("--passo", type=float, default=0.1, help="Passo inicial do preditor")
+    parser.add_argument("--sem-geracao", action="store_true", help="A slack assume todo o acréscimo de carga")
+    parser.add_argument("--ate-nariz", action="store_true", help="Para logo após o ponto de máximo carregamento")
+    parser.add_argument("--saida", default="continuacao.npz", help="Arquivo .npz com λ e as curvas PV")
+    args = parser.parse_args()
+
+    try:
+        caso = load_case(args.barras, args.impedancias)  # Caso compilado (barras, ramos e Ybus)
+    except Exception as e:
+        print(f"\nErro: {e}")
+        return
+    barras = caso['barras']
+    start_time = time.time()
+    resultado = continuation_power_flow(caso['Ybus'], barras, load_direction(barras, not args.sem_geracao),
+                                        passo=args.passo, ate_nariz=args.ate_nariz)
+    carga = np.sum(barras['p_carga']) * S_BASE  # Carga ativa do caso base (MW)
+    print(f"\n{len(resultado['lambda'])} pontos em {time.time() - start_time:.2f} s ({resultado['fatoracoes']} fatorações)")
+    print(f"Máximo carregamento: λ = {resultado['lambda_max']:.4f} "
+          f"({carga * (1 + resultado['lambda_max']):.1f} MW de carga, base {carga:.1f} MW)")
+    print(f"Barra crítica: {resultado['barra_critica'] + 1}")
+    print("\nBarra | |V| base | |V| no nariz")
+    for i, (v0, vn) in enumerate(zip(np.abs(resultado['V'][0]), np.abs(resultado['V_nariz']))):
+        print(f"{i + 1} | {v0:.4f} | {vn:.4f}")
+    np.savez(args.saida, **resultado)
+    print(f"\nCurvas salvas em {args.saida}")
+
+if __name__ == "__main__":
+    main()
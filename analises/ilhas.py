@@ -0,0 +1,90 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import os  # Importa o módulo os para consultar o número de processadores
+import time  # Importa o módulo time para medir o tempo de execução
+from concurrent.futures import ProcessPoolExecutor  # Pool de processos para as ilhas
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.topologia import ORDENACOES, split_islands  # Ilhas, slacks e reordenação de barras
+from metodo_desacoplado_rapido.fast_decoupled import fast_decoupled_power_flow  # Solver desacoplado rápido
+from metodo_gauss_seidel.lib.gauss_seidel import solve_power_flow  # Solver Gauss-Seidel
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+METODOS = ("nr", "fdlf", "gs")  # Métodos disponíveis
+TOLERANCIA = 1e-6  # Tolerância padrão dos solvers
+MIN_BARRAS_PROCESSO = 2000  # Ilhas menores são resolvidas no processo principal (não compensam a serialização)
+
+def _solve_island(subcaso, metodo, tol, ordenacao):
+    """Resolve uma ilha com o método escolhido; devolve (V, iterações, erro)
+
+    Com as barras reordenadas, NR e FDLF fatoram na ordem das barras; com ordenacao="natural", o SuperLU
+    escolhe a ordenação (grau mínimo) a cada fatoração.
+    """
+    Ybus, barras, ramos = subcaso['Ybus'], subcaso['barras'], subcaso['ramos']
+    fatoracao = "mmd" if ordenacao == "natural" else "natural"  # Ordenação usada pela LU
+    if np.all(barras['tipo'] == 1):  # Ilha só com a slack (ex.: gerador isolado): sem incógnitas, V = especificada
+        return barras['v'].astype(complex), 0, 0.0
+    if metodo == "nr":
+        return newton_raphson_power_flow(Ybus, barras, tol=tol, ordenacao=fatoracao)
+    if metodo == "fdlf":
+        return fast_decoupled_power_flow(Ybus, barras, ramos, tol=tol, ordenacao=fatoracao)
+    return solve_power_flow(Ybus, barras, ramos, erro_max=tol)[:3]
+
+def solve_islands(Ybus, bus_data, impedancias, metodo="nr", processos=None, ordenacao="mmd", tol=TOLERANCIA):
+    """Fluxo de carga por ilha: cada ilha energizada tem sua slack, barras reordenadas e solução independente
+
+    Ilhas grandes são distribuídas entre processos; barras de ilhas desenergizadas ficam com tensão nula.
+    Retorna (V, maior número de iterações, maior erro, topologia), com topologia = {'ilhas', 'energizada', 'tipo'}.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo}")
+    subcasos, ilhas, energizada, tipo = split_islands(Ybus, bus_data, impedancias, ordenacao)
+    V = np.zeros(len(ilhas), dtype=complex)  # Tensões globais (zero nas ilhas desenergizadas)
+    grandes = [s for s in subcasos if len(s['indices']) >= MIN_BARRAS_PROCESSO]
+    pequenas = [s for s in subcasos if len(s['indices']) < MIN_BARRAS_PROCESSO]
+    processos = min(processos or os.cpu_count() or 1, len(grandes))
+    resultados = []
+    if processos > 1:
+        grandes.sort(key=lambda s: -len(s['indices']))  # Maiores primeiro: melhor balanceamento
+        with ProcessPoolExecutor(processos) as pool:
+            futuros = [pool.submit(_solve_island, s, metodo, tol, ordenacao) for s in grandes]
+            resultados += [(s, _solve_island(s, metodo, tol, ordenacao)) for s in pequenas]  # Em paralelo com o pool
+            resultados += [(s, f.result()) for s, f in zip(grandes, futuros)]
+    else:
+        resultados = [(s, _solve_island(s, metodo, tol, ordenacao)) for s in subcasos]
+    iteracoes, erro = 0, 0.0
+    for subcaso, (V_ilha, it, erro_ilha) in resultados:
+        V[subcaso['indices']] = V_ilha
+        iteracoes, erro = max(iteracoes, it), max(erro, erro_ilha)
+    return V, iteracoes, erro, {'ilhas': ilhas, 'energizada': energizada, 'tipo': tipo}
+
+def main():
+    parser = argparse.ArgumentParser(description="Fluxo de carga por ilha elétrica, com slack por ilha e reordenação de barras")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos")
+    parser.add_argument("--metodo", default="nr", choices=METODOS, help="Método de solução")
+    parser.add_argument("--ordenacao", default="mmd", choices=ORDENACOES, help="Ordenação das barras de cada ilha")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("--saida", default="ilhas.npz", help="Arquivo .npz com tensões e ilhas")
+    args = parser.parse_args()
+
+    try:
+        caso = load_case(args.barras, args.impedancias)  # Caso compilado (barras, ramos e Ybus)
+    except Exception as e:
+        print(f"\nErro: {e}")
+        return
+    start_time = time.time()
+    V, iteracoes, erro, topologia = solve_islands(caso['Ybus'], caso['barras'], caso['ramos'], args.metodo,
+                                                  args.processos, args.ordenacao)
+    print(f"\n{len(topologia['energizada'])} ilha(s), {int(np.sum(topologia['energizada']))} energizada(s); "
+          f"resolvidas em {time.time() - start_time:.2f} s (até {iteracoes} iterações, erro {erro:.2e})")
+    alteradas = np.flatnonzero(topologia['tipo'] != caso['barras']['tipo'])
+    for i in alteradas:
+        print(f"Barra {i + 1}: tipo {caso['barras']['tipo'][i]} -> {topologia['tipo'][i]} (ilha {topologia['ilhas'][i] + 1})")
+    desligadas = np.flatnonzero(~topologia['energizada'][topologia['ilhas']])
+    if len(desligadas):
+        print(f"Barras desenergizadas: {', '.join(str(i + 1) for i in desligadas)}")
+    np.savez(args.saida, V=V, ilhas=topologia['ilhas'] + 1, tipo=topologia['tipo'])
+    print(f"Resultados salvos em {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import time  # Importa o módulo time para medir o tempo de execução
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from comum.barras import S_BASE, bus_arrays  # Vetores das barras e potência base
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.fluxos import branch_flows  # Fluxos vetorizados nos ramos
+from comum.newton import build_jacobian, factorize, mismatch  # Resíduos, Jacobiana e fatoração esparsa
+from comum.ybus import branch_admittances, branch_arrays  # Modelo π dos ramos
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+from .serie_temporal import load_profiles  # Leitura de amostras no formato P_<barra>/Q_<barra>
+
+TOLERANCIA = 1e-6  # Tolerância dos resíduos de potência (pu)
+QUANTIS = (0.05, 0.5, 0.95)  # Quantis padrão das estatísticas
+
+class StreamingStats:
+    """Média, desvio e quantis por coluna acumulados bloco a bloco, sem guardar as amostras
+
+    Os quantis vêm de histogramas de `classes` faixas em [minimo, maximo]; valores fora da faixa
+    entram nas faixas extremas.
+    """
+
+    def __init__(self, n, minimo, maximo, classes=1000):
+        self.n = n  # Número de colunas (barras ou ramos)
+        self.minimo = np.broadcast_to(np.asarray(minimo, dtype=float), (n,)).copy()  # Limite inferior de cada histograma
+        self.largura = (np.broadcast_to(np.asarray(maximo, dtype=float), (n,)) - self.minimo) / classes  # Largura das faixas
+        self.largura[~(self.largura > 0)] = 1.0 / classes  # Coluna constante: faixa unitária
+        self.classes = classes
+        self.contagem = 0  # Amostras acumuladas
+        self.soma = np.zeros(n)
+        self.soma2 = np.zeros(n)
+        self.histograma = np.zeros((n, classes), dtype=np.int64)
+
+    def update(self, X):
+        """Acumula um bloco (amostras x colunas)"""
+        X = np.asarray(X, dtype=float)
+        self.contagem += len(X)
+        self.soma += X.sum(axis=0)
+        self.soma2 += (X * X).sum(axis=0)
+        faixa = np.clip(((X - self.minimo) / self.largura).astype(np.int64), 0, self.classes - 1)
+        chave = (np.arange(self.n) * self.classes + faixa).ravel()  # Posição linear (coluna, faixa)
+        self.histograma += np.bincount(chave, minlength=self.n * self.classes).reshape(self.n, self.classes)
+
+    def mean(self):
+        return self.soma / max(self.contagem, 1)
+
+    def std(self):
+        media = self.mean()
+        return np.sqrt(np.maximum(self.soma2 / max(self.contagem, 1) - media ** 2, 0))
+
+    def quantiles(self, quantis):
+        """Quantis por coluna (len(quantis) x colunas), interpolados dentro da faixa"""
+        acumulado = np.cumsum(self.histograma, axis=1)
+        saida = np.empty((len(quantis), self.n))
+        for i, q in enumerate(quantis):
+            alvo = q * self.contagem
+            faixa = np.argmax(acumulado >= alvo, axis=1)  # Primeira faixa que atinge o quantil
+            antes = np.where(faixa > 0, acumulado[np.arange(self.n), faixa - 1], 0)
+            dentro = self.histograma[np.arange(self.n), faixa]
+            fracao = np.where(dentro > 0, (alvo - antes) / np.maximum(dentro, 1), 0.5)
+            saida[i] = self.minimo + (faixa + fracao) * self.largura
+        return saida
+
+def sample_injections(bus_data, n_amostras, desvio=0.1, semente=None):
+    """Amostras de injeções líquidas (MW/MVAr): cargas com fator normal de média 1 e desvio `desvio` por barra
+
+    Gerações mantêm o valor de Barras.xlsx; o fator é o mesmo para P e Q de cada carga (fator de potência constante).
+    """
+    barras = bus_arrays(bus_data)
+    rng = np.random.default_rng(semente)
+    fator = np.maximum(rng.normal(1.0, desvio, (n_amostras, len(barras['tipo']))), 0)  # Fatores de carga
+    P = (barras['p'] + barras['p_carga']) * S_BASE - fator * barras['p_carga'] * S_BASE  # Geração - carga amostrada
+    Q = (barras['q'] + barras['q_carga']) * S_BASE - fator * barras['q_carga'] * S_BASE
+    return P, Q
+
+def _solve_block(Ybus, barras, S_esp, V_base, lu, var_theta, PQ_idx, max_iter):
+    """Newton com Jacobiana fixa (do caso base) para várias amostras de uma vez (colunas de S_esp)
+
+    Amostras que convergem saem das iterações seguintes; as que não convergem são resolvidas
+    individualmente pelo Newton-Raphson completo. Devolve tensões (barras x amostras), iterações e erros.
+    """
+    n, k = S_esp.shape
+    n_theta = len(var_theta)
+    Vm = np.repeat(np.abs(V_base)[:, None], k, axis=1)  # Módulos de partida (solução do caso base)
+    Va = np.repeat(np.angle(V_base)[:, None], k, axis=1)  # Ângulos de partida
+    iteracoes = np.zeros(k, dtype=np.int64)
+    erros = np.full(k, np.inf)
+    ativas = np.arange(k)  # Amostras ainda não convergidas
+    for it in range(max_iter):
+        residuo = mismatch(Ybus, Vm[:, ativas] * np.exp(1j * Va[:, ativas]), S_esp[:, ativas], var_theta, PQ_idx)
+        erro = np.max(np.abs(residuo), axis=0, initial=0)  # Maior resíduo de cada amostra
+        erros[ativas], iteracoes[ativas] = erro, it
+        continua = erro >= TOLERANCIA
+        if not np.any(continua):
+            ativas = ativas[:0]
+            break
+        ativas, residuo = ativas[continua], residuo[:, continua]  # Remove as amostras convergidas
+        dx = lu.solve(residuo)  # Uma substituição para todas as amostras ativas
+        Va[var_theta[:, None], ativas] += dx[:n_theta]
+        Vm[PQ_idx[:, None], ativas] += dx[n_theta:]
+    else:
+        residuo = mismatch(Ybus, Vm[:, ativas] * np.exp(1j * Va[:, ativas]), S_esp[:, ativas], var_theta, PQ_idx)
+        erros[ativas], iteracoes[ativas] = np.max(np.abs(residuo), axis=0, initial=0), max_iter
+        ativas = ativas[~(erros[ativas] < TOLERANCIA)]
+    V = Vm * np.exp(1j * Va)
+    for j in ativas:  # Amostras lentas ou divergentes: Newton-Raphson completo a partir do caso base
+        amostra = dict(barras, p=S_esp[:, j].real, q=S_esp[:, j].imag)
+        V[:, j], it_nr, erros[j] = newton_raphson_power_flow(Ybus, amostra, tol=TOLERANCIA, V0=V_base,
+                                                             limites=None)  # Sem limitar |V|: subtensão conta como violação
+        iteracoes[j] += it_nr
+    return V, iteracoes, erros
+
+def run_probabilistic(Ybus, bus_data, impedancias, P_mw, Q_mvar, vmin=0.95, vmax=1.05, quantis=QUANTIS,
+                      bloco=1000, max_iter=15, classes=1000):
+    """Fluxo de carga probabilístico: resolve as amostras (linhas de P_mw/Q_mvar) em blocos vetorizados
+
+    Devolve só estatísticas acumuladas por barra (|V|) e por ramo (maior fluxo aparente, MVA): média, desvio,
+    quantis e probabilidade de violação (fora de [vmin, vmax] ou acima de LIMITE (MVA)). A violação de tensão só é
+    avaliada nas barras PQ: slack e PV mantêm a tensão especificada e ficam com probabilidade nula.
+    Amostras que não convergem ficam fora das estatísticas e são contadas em 'nao_convergidas'.
+    """
+    Ybus = Ybus.tocsr()  # Garante o formato CSR
+    barras = bus_arrays(bus_data)  # Vetores das barras do caso base
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    P = np.atleast_2d(np.asarray(P_mw, dtype=float)) / S_BASE  # Injeções ativas (pu)
+    Q = np.atleast_2d(np.asarray(Q_mvar, dtype=float)) / S_BASE  # Injeções reativas (pu)
+    n = len(barras['tipo'])
+    if P.shape != Q.shape or P.shape[1] != n:
+        raise ValueError(f"Amostras devem ter {n} colunas de P e de Q")
+    tipo = barras['tipo']
+    PQ_idx = np.flatnonzero(tipo == 0)
+    var_theta = np.concatenate([PQ_idx, np.flatnonzero(tipo == 2)])
+    V_base, _, erro = newton_raphson_power_flow(Ybus, barras, tol=TOLERANCIA, limites=None)  # Caso base
+    if erro >= TOLERANCIA:
+        raise RuntimeError(f"O caso base não convergiu (erro {erro:.3e})")
+    lu = factorize(build_jacobian(Ybus, V_base, var_theta, PQ_idx))  # Jacobiana do caso base, fatorada uma vez
+    adm = branch_admittances(ramos)
+    S_de, S_para = branch_flows(V_base, ramos, adm)
+    carga_base = np.maximum(np.abs(S_de), np.abs(S_para)) * S_BASE  # Fluxos do caso base (MVA)
+    est_V = StreamingStats(n, 0.8, 1.2, classes)  # Módulos de tensão (pu)
+    est_S = StreamingStats(len(ramos['de']), 0, 3 * carga_base + 1, classes)  # Fluxos aparentes (MVA)
+    violacao_V = np.zeros(n, dtype=np.int64)
+    violacao_S = np.zeros(len(ramos['de']), dtype=np.int64)
+    nao_convergidas = 0
+    iteracoes = 0
+    for inicio in range(0, len(P), bloco):
+        S_esp = (P[inicio:inicio + bloco] + 1j * Q[inicio:inicio + bloco]).T  # Barras x amostras
+        V, it, erros = _solve_block(Ybus, barras, S_esp, V_base, lu, var_theta, PQ_idx, max_iter)
+        ok = erros < TOLERANCIA
+        nao_convergidas += int(np.sum(~ok))
+        iteracoes += int(np.sum(it))
+        V = V[:, ok].T  # Amostras convergidas (amostras x barras)
+        modulo = np.abs(V)
+        S_de, S_para = branch_flows(V, ramos, adm)
+        carga = np.maximum(np.abs(S_de), np.abs(S_para)) * S_BASE
+        est_V.update(modulo)
+        est_S.update(carga)
+        violacao_V[PQ_idx] += np.sum((modulo[:, PQ_idx] < vmin) | (modulo[:, PQ_idx] > vmax), axis=0)
+        violacao_S += np.sum(carga > ramos['limite'], axis=0)
+    validas = max(est_V.contagem, 1)
+    return {
+        'amostras': len(P),
+        'nao_convergidas': nao_convergidas,
+        'iteracoes_medias': iteracoes / max(len(P), 1),
+        'quantis': np.asarray(quantis),
+        'V_media': est_V.mean(),  # Módulo médio de tensão por barra (pu)
+        'V_desvio': est_V.std(),
+        'V_quantis': est_V.quantiles(quantis),  # (quantis x barras)
+        'V_prob_violacao': violacao_V / validas,  # Probabilidade de |V| fora de [vmin, vmax] (barras PQ)
+        'S_media': est_S.mean(),  # Fluxo aparente médio por ramo (MVA)
+        'S_desvio': est_S.std(),
+        'S_quantis': est_S.quantiles(quantis),  # (quantis x ramos)
+        'S_prob_sobrecarga': violacao_S / validas,  # Probabilidade de fluxo acima de LIMITE (MVA)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Fluxo de carga probabilístico (Monte Carlo vetorizado)")
+    parser.add_argument("--amostras", type=int, default=1000, help="Número de amostras sorteadas")
+    parser.add_argument("--desvio", type=float, default=0.1, help="Desvio padrão relativo das cargas")
+    parser.add_argument("--semente", type=int, default=None, help="Semente do sorteio")
+    parser.add_argument("--perfis", default=None, help="Amostras prontas: CSV/Excel com colunas P_<barra> e Q_<barra> (MW/MVAr)")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos (LIMITE (MVA) opcional)")
+    parser.add_argument("--vmin", type=float, default=0.95, help="Tensão mínima (pu)")
+    parser.add_argument("--vmax", type=float, default=1.05, help="Tensão máxima (pu)")
+    parser.add_argument("--saida", default="probabilistico.npz", help="Arquivo .npz com as estatísticas")
+    args = parser.parse_args()
+
+    try:
+        caso = load_case(args.barras, args.impedancias)  # Caso compilado (barras, ramos e Ybus)
+        if args.perfis:
+            P, Q = load_profiles(args.perfis, caso['barras'])
+        else:
+            P, Q = sample_injections(caso['barras'], args.amostras, args.desvio, args.semente)
+    except Exception as e:
+        print(f"\nErro: {e}")
+        return
+    start_time = time.time()
+    resultado = run_probabilistic(caso['Ybus'], caso['barras'], caso['ramos'], P, Q, args.vmin, args.vmax)
+    print(f"\n{resultado['amostras']} amostras resolvidas em {time.time() - start_time:.2f} s "
+          f"({resultado['iteracoes_medias']:.2f} iterações médias; {resultado['nao_convergidas']} não convergidas)")
+    print("\nBarra | |V| médio | " + " | ".join(f"q{int(q * 100)}" for q in resultado['quantis']) + " | P(violação)")
+    for i in range(len(resultado['V_media'])):
+        print(f"{i + 1} | {resultado['V_media'][i]:.4f} | "
+              + " | ".join(f"{v:.4f}" for v in resultado['V_quantis'][:, i]) + f" | {resultado['V_prob_violacao'][i]:.3f}")
+    np.savez(args.saida, **resultado)
+    print(f"\nEstatísticas salvas em {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import csv  # Importa o módulo csv para gravar a tabela de triagem
+import hashlib  # Importa o módulo hashlib para identificar a topologia
+import os  # Importa o módulo os para manipular caminhos
+import time  # Importa o módulo time para medir o tempo de execução
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from comum.barras import S_BASE, bus_arrays  # Vetores das barras e potência base
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.newton import factorize  # Fatoração esparsa
+from comum.ybus import branch_arrays  # Vetores dos ramos
+from .contingencia import COLUNAS, run_contingencies  # Análise N-1 completa (CA) dos casos sinalizados
+
+VERSAO = 1  # Versão do formato do cache; alterar invalida os caches existentes
+COLUNAS_TRIAGEM = ('ramo', 'de', 'para', 'pior_ramo', 'fluxo', 'limite', 'carregamento')  # Colunas da triagem N-1
+
+def dc_matrices(ramos, n_barras):
+    """Matrizes do fluxo de carga CC: B (barras), Bf (ramos x barras) e incidência A, com susceptâncias 1/(x·tap)"""
+    m = len(ramos['de'])  # Número de ramos
+    b = 1 / (ramos['x'] * ramos['tap'])  # Susceptâncias série do modelo CC
+    k = np.arange(m)
+    A = sparse.csr_matrix((np.r_[np.ones(m), -np.ones(m)], (np.r_[k, k], np.r_[ramos['de'], ramos['para']])),
+                          shape=(m, n_barras))  # Incidência ramo-barra (+1 no DE, -1 no PARA)
+    Bf = sparse.diags(b) @ A  # Fluxo em cada ramo por ângulo de barra
+    return (A.T @ Bf).tocsc(), Bf.tocsr(), A
+
+def dc_power_flow(impedancias, bus_data):
+    """Fluxo de carga CC: ângulos (rad) e fluxos ativos nos ramos (pu), com a slack como referência angular"""
+    barras = bus_arrays(bus_data)  # Vetores das barras
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    tipo = barras['tipo']
+    n = len(tipo)
+    B, Bf, _ = dc_matrices(ramos, n)
+    nao_ref = np.flatnonzero(tipo != 1)  # Barras com ângulo a calcular
+    theta = np.zeros(n)
+    theta[nao_ref] = factorize(B[nao_ref][:, nao_ref]).solve(barras['p'][nao_ref])
+    return theta, Bf @ theta
+
+def sensitivity_matrices(impedancias, tipo):
+    """PTDF (ramos x barras, injeção na barra e retirada na slack) e LODF (ramos x ramos)
+
+    LODF[l, k] é a fração do fluxo do ramo k transferida para o ramo l quando k sai; a coluna de um
+    ramo cuja saída separa a rede (ilhamento) fica com NaN. Memória: 8·m·(n + m) bytes.
+    """
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    n, m = len(tipo), len(ramos['de'])
+    B, Bf, _ = dc_matrices(ramos, n)
+    nao_ref = np.flatnonzero(tipo != 1)  # Colunas da slack ficam nulas
+    ptdf = np.zeros((m, n))
+    if len(nao_ref) and m:
+        ptdf[:, nao_ref] = factorize(B[nao_ref][:, nao_ref]).solve(Bf[:, nao_ref].T.toarray()).T  # B simétrica: PTDF^T = B^-1 Bf^T
+    H = ptdf[:, ramos['de']] - ptdf[:, ramos['para']]  # Fluxo em cada ramo por transferência entre os terminais de k
+    denominador = 1 - np.diag(H)
+    ilhamento = np.abs(denominador) < 1e-8  # A saída do ramo separa a rede
+    lodf = H / np.where(ilhamento, np.nan, denominador)
+    np.fill_diagonal(lodf, -1.0)  # O ramo que sai perde todo o seu fluxo
+    lodf[:, ilhamento] = np.nan
+    return {'ptdf': ptdf, 'lodf': lodf, 'ilhamento': ilhamento}
+
+def _topology_key(ramos, tipo):
+    """Identifica a topologia: ramos, reatâncias, taps e posição da slack"""
+    h = hashlib.sha1(f"{VERSAO}|{len(tipo)}".encode("utf-8"))
+    for v in (ramos['de'], ramos['para'], ramos['x'], ramos['tap'], np.flatnonzero(tipo == 1)):
+        h.update(np.ascontiguousarray(v).tobytes())
+    return h.hexdigest()[:16]
+
+def load_sensitivities(impedancias, tipo, cache_dir=None):
+    """PTDF/LODF da topologia, lidas de `cache_dir` se já calculadas; sem cache_dir, apenas calcula"""
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    caminho = os.path.join(cache_dir, f"sens_{_topology_key(ramos, tipo)}.npz") if cache_dir else None
+    if caminho and os.path.exists(caminho):
+        try:
+            with np.load(caminho) as dados:
+                return {k: dados[k] for k in ('ptdf', 'lodf', 'ilhamento')}
+        except (OSError, ValueError, KeyError):
+            pass  # Cache corrompido ou incompleto: recalcula
+    sens = sensitivity_matrices(ramos, tipo)
+    if caminho:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            np.savez(arquivo, **sens)
+        os.replace(temporario, caminho)  # Troca atômica: leitores nunca veem um cache incompleto
+    return sens
+
+def screen_injections(sens, fluxos, dP):
+    """Fluxos após variações de injeção: dP (pu) com uma coluna por caso -> fluxos (ramos x casos)"""
+    return fluxos[:, None] + sens['ptdf'] @ np.asarray(dP).reshape(sens['ptdf'].shape[1], -1)
+
+def screen_outages(sens, fluxos, ramos_fora=None):
+    """Fluxos após a saída de cada ramo de ramos_fora (base zero; padrão: todos) -> (ramos x contingências)"""
+    indices = np.arange(len(fluxos)) if ramos_fora is None else np.asarray(ramos_fora)
+    fluxos = np.asarray(fluxos)
+    pos = fluxos[..., None] + sens['lodf'][:, indices] * fluxos[indices]  # Redistribuição do fluxo de cada ramo retirado
+    pos[indices, np.arange(len(indices))] = 0  # Ramo desligado
+    return pos
+
+def flag_outages(sens, fluxos, limite, ramos_fora=None, margem=1.0):
+    """Contingências que merecem o fluxo de carga CA: sobrecarga CC acima de margem·limite ou ilhamento
+
+    fluxos em pu e limite em MVA; devolve (índices sinalizados, tabela de triagem por COLUNAS_TRIAGEM, base zero).
+    """
+    indices = np.arange(len(fluxos)) if ramos_fora is None else np.asarray(ramos_fora)
+    pos = screen_outages(sens, fluxos, indices) * S_BASE  # Fluxos após cada contingência (MW)
+    carregamento = np.abs(pos) / limite[:, None]  # Fração do limite de cada ramo
+    carregamento[:, sens['ilhamento'][indices]] = np.inf  # Ilhamento: sempre vai para a análise CA
+    coluna = np.arange(len(indices))
+    pior = np.argmax(carregamento, axis=0)  # Ramo mais carregado em cada contingência
+    sinal = carregamento[pior, coluna] > margem
+    tabela = {
+        'ramo': indices[sinal],
+        'pior_ramo': pior[sinal],
+        'fluxo': pos[pior, coluna][sinal],
+        'limite': limite[pior][sinal],
+        'carregamento': carregamento[pior, coluna][sinal],
+    }
+    return indices[sinal], tabela
+
+def main():
+    parser = argparse.ArgumentParser(description="Triagem N-1 por fluxo de carga CC com PTDF/LODF")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos (LIMITE (MVA) opcional)")
+    parser.add_argument("--margem", type=float, default=0.9, help="Fração do limite que sinaliza a contingência")
+    parser.add_argument("--ca", action="store_true", help="Resolve as contingências sinalizadas pelo fluxo de carga CA")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos da análise CA")
+    parser.add_argument("--saida", default="triagem.csv", help="Arquivo CSV da triagem (ou das violações, com --ca)")
+    args = parser.parse_args()
+
+    try:
+        caso = load_case(args.barras, args.impedancias)  # Caso compilado (barras, ramos e Ybus)
+    except Exception as e:
+        print(f"\nErro: {e}")
+        return
+    barras, ramos = caso['barras'], caso['ramos']
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(args.barras)), ".cache")  # Mesmo cache do caso
+    start_time = time.time()
+    sens = load_sensitivities(ramos, barras['tipo'], cache_dir)  # PTDF/LODF da topologia
+    print(f"\nPTDF/LODF prontas em {time.time() - start_time:.3f} segundos")
+    start_time = time.time()
+    _, fluxos = dc_power_flow(ramos, barras)  # Caso base CC
+    sinalizados, tabela = flag_outages(sens, fluxos, ramos['limite'], margem=args.margem)
+    print(f"{len(fluxos)} contingências triadas em {(time.time() - start_time) * 1000:.2f} ms; {len(sinalizados)} sinalizadas")
+    if args.ca:
+        start_time = time.time()
+        violacoes = run_contingencies(caso['Ybus'], barras, ramos, ramos_fora=sinalizados, processos=args.processos)
+        print(f"{len(sinalizados)} contingências resolvidas por Newton-Raphson em {time.time() - start_time:.2f} segundos")
+        colunas, linhas = COLUNAS, zip(*(violacoes[c] for c in COLUNAS))
+    else:
+        tabela['de'] = ramos['de'][tabela['ramo']] + 1
+        tabela['para'] = ramos['para'][tabela['ramo']] + 1
+        tabela['ramo'] = tabela['ramo'] + 1
+        tabela['pior_ramo'] = tabela['pior_ramo'] + 1
+        colunas, linhas = COLUNAS_TRIAGEM, zip(*(tabela[c] for c in COLUNAS_TRIAGEM))
+    with open(args.saida, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(colunas)
+        escritor.writerows(linhas)
+    print(f"Tabela salva em {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import os  # Importa o módulo os para consultar o número de processadores
+import time  # Importa o módulo time para medir o tempo de execução
+from concurrent.futures import ProcessPoolExecutor  # Pool de processos para os blocos da série
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from comum.barras import S_BASE, bus_arrays  # Vetores das barras e potência base
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.saida import FORMATOS, ResultWriter  # Gravação em colunas, bloco a bloco
+from comum.ybus import branch_arrays  # Vetores dos ramos
+from metodo_desacoplado_rapido.fast_decoupled import decoupled_factors, fast_decoupled_power_flow  # Solver desacoplado rápido
+from metodo_gauss_seidel.lib.gauss_seidel import solve_power_flow  # Solver Gauss-Seidel
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+METODOS = ("nr", "fdlf", "gs")  # Métodos disponíveis
+TOLERANCIA = 1e-6  # Tolerância padrão dos solvers
+
+_contexto = {}  # Estado de cada processo de trabalho (rede montada uma única vez)
+
+def _init_worker(Ybus, barras, ramos, metodo, V_base):
+    """Inicializa um processo de trabalho com a rede e a fatoração da topologia"""
+    _contexto.update(Ybus=Ybus, barras=barras, ramos=ramos, metodo=metodo, V_base=V_base)
+    if metodo == "fdlf":
+        _contexto['fatores'] = decoupled_factors(ramos, barras['tipo'])  # B' e B'' fatoradas uma vez por processo
+
+def _solve_snapshot(barras, V0):
+    """Resolve um instante da série com o método do contexto"""
+    Ybus, ramos, metodo = _contexto['Ybus'], _contexto['ramos'], _contexto['metodo']
+    if metodo == "nr":
+        return newton_raphson_power_flow(Ybus, barras, V0=V0)
+    if metodo == "fdlf":
+        return fast_decoupled_power_flow(Ybus, barras, ramos, V0=V0, fatores=_contexto['fatores'])
+    return solve_power_flow(Ybus, barras, ramos, V0=V0)
+
+def _solve_chunk(P, Q):
+    """Resolve um bloco contínuo de instantes, partindo cada um da solução anterior"""
+    V_base = _contexto['V_base']  # Solução do caso base
+    V_ant = V_base  # Estimativa inicial do primeiro instante do bloco
+    tensoes = np.empty(P.shape, dtype=complex)  # Tensões de cada instante
+    iteracoes = np.empty(len(P), dtype=np.int64)  # Iterações de cada instante
+    erros = np.empty(len(P))  # Erro final de cada instante
+    for k in range(len(P)):
+        barras = dict(_contexto['barras'], p=P[k], q=Q[k])  # Injeções do instante k
+        tensoes[k], iteracoes[k], erros[k] = _solve_snapshot(barras, V_ant)
+        V_ant = tensoes[k] if erros[k] <= TOLERANCIA else V_base  # Não parte de uma solução divergente
+    return tensoes, iteracoes, erros
+
+def run_time_series(Ybus, bus_data, impedancias, P_mw, Q_mvar, metodo="nr", processos=None, blocos=None, escritor=None):
+    """Resolve uma série de instantes (linhas de P_mw/Q_mvar, injeções líquidas por barra) sobre a mesma rede
+
+    A rede é montada uma única vez, cada instante parte da solução do instante anterior
+    e blocos contínuos da série são distribuídos entre processos.
+    Com `escritor` (comum.saida.ResultWriter), cada bloco é gravado assim que resolvido e as tensões
+    não são acumuladas: o resultado traz só iterações, erros e convergência.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo} (use {', '.join(METODOS)})")
+    Ybus = Ybus.tocsr()  # Garante o formato CSR
+    barras = bus_arrays(bus_data)  # Vetores das barras do caso base
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    P = np.atleast_2d(np.asarray(P_mw, dtype=float)) / S_BASE  # Injeções ativas (pu)
+    Q = np.atleast_2d(np.asarray(Q_mvar, dtype=float)) / S_BASE  # Injeções reativas (pu)
+    if P.shape != Q.shape or P.shape[1] != len(barras['tipo']):
+        raise ValueError(f"Perfis devem ter {len(barras['tipo'])} colunas de P e de Q")
+    processos = processos or os.cpu_count() or 1  # Número de processos
+    blocos = min(blocos or 4 * processos, len(P))  # Número de blocos contínuos
+    _init_worker(Ybus, barras, ramos, metodo, None)
+    V_base, _, _ = _solve_snapshot(barras, None)  # Caso base resolvido uma vez, ponto de partida de cada bloco
+    fatias = np.array_split(np.arange(len(P)), blocos)  # Índices de cada bloco
+    def recebe(parte):  # Grava o bloco no escritor e descarta as tensões
+        if escritor is None:
+            return parte
+        escritor.append_voltages(parte[0], Ybus)
+        return (parte[0][:, :0],) + parte[1:]
+    if processos == 1:
+        _contexto['V_base'] = V_base
+        partes = [recebe(_solve_chunk(P[f], Q[f])) for f in fatias]
+    else:
+        with ProcessPoolExecutor(processos, initializer=_init_worker,
+                                 initargs=(Ybus, barras, ramos, metodo, V_base)) as pool:
+            partes = [recebe(p) for p in pool.map(_solve_chunk, [P[f] for f in fatias], [Q[f] for f in fatias])]
+    tensoes, iteracoes, erros = (np.concatenate(c) for c in zip(*partes))
+    resultado = {
+        'V': tensoes,  # Tensões complexas (instantes x barras)
+        'iteracoes': iteracoes,  # Iterações por instante
+        'erros': erros,  # Erro final por instante
+        'convergiu': erros <= TOLERANCIA  # Indicador de convergência por instante
+    }
+    if escritor is not None:
+        del resultado['V']  # Tensões já gravadas pelo escritor
+    return resultado
+
+def load_profiles(filepath, bus_data):
+    """Carrega a tabela de perfis (uma linha por instante, colunas P_<barra> e Q_<barra> em MW/MVAr)
+
+    Barras sem coluna no arquivo mantêm a injeção do caso base.
+    """
+    import pandas as pd  # Importação local: os processos de trabalho não precisam do pandas
+    try:
+        tabela = pd.read_csv(filepath) if filepath.endswith(".csv") else pd.read_excel(filepath)
+    except Exception as e:
+        raise Exception(f"Erro ao carregar perfis: {e}")
+    barras = bus_arrays(bus_data)  # Vetores do caso base
+    P = np.tile(barras['p'] * S_BASE, (len(tabela), 1))  # Injeções ativas do caso base (MW)
+    Q = np.tile(barras['q'] * S_BASE, (len(tabela), 1))  # Injeções reativas do caso base (MVAr)
+    for i in range(len(barras['tipo'])):
+        if f"P_{i+1}" in tabela.columns:
+            P[:, i] = tabela[f"P_{i+1}"].to_numpy(dtype=float)
+        if f"Q_{i+1}" in tabela.columns:
+            Q[:, i] = tabela[f"Q_{i+1}"].to_numpy(dtype=float)
+    return P, Q
+
+def main():
+    parser = argparse.ArgumentParser(description="Fluxo de carga em série temporal com partida a quente")
+    parser.add_argument("perfis", help="Tabela CSV/Excel com colunas P_<barra> e Q_<barra> (MW/MVAr)")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos")
+    parser.add_argument("--metodo", default="nr", choices=METODOS, help="Método de solução")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("--saida", default="serie_temporal.npz", help="Arquivo .npz de saída")
+    parser.add_argument("--resultados", default=None, help="Pasta do conjunto de dados de barras e ramos, gravado bloco a bloco")
+    parser.add_argument("--formato", default="auto", choices=FORMATOS, help="Formato do conjunto de dados (auto: Parquet se pyarrow estiver instalado, senão NPZ)")
+    args = parser.parse_args()
+
+    try:
+        caso = load_case(args.barras, args.impedancias)  # Caso compilado (barras, ramos e Ybus montada uma única vez)
+        P, Q = load_profiles(args.perfis, caso['barras'])  # Carrega os perfis
+    except Exception as e:
+        print(f"\nErro: {e}")
+        return
+    processos = args.processos or os.cpu_count() or 1
+    start_time = time.time()  # Marca o tempo inicial
+    escritor = ResultWriter(args.resultados, caso['ramos'], args.formato) if args.resultados else None
+    try:
+        resultado = run_time_series(caso['Ybus'], caso['barras'], caso['ramos'], P, Q, args.metodo, processos, escritor=escritor)
+    finally:
+        if escritor is not None:
+            escritor.close()  # Grava os blocos pendentes
+    duracao = time.time() - start_time  # Tempo de solução
+    np.savez(args.saida, **resultado)  # Salva os resultados
+    print(f"\n{len(P)} instantes resolvidos em {duracao:.2f} s ({len(P) / duracao / processos:.1f} instantes/s por núcleo)")
+    print(f"Não convergidos: {int(np.sum(~resultado['convergiu']))} | Iterações médias: {np.mean(resultado['iteracoes']):.2f}")
+    print(f"Resultados salvos em {args.saida}" + (f" e {args.resultados} ({escritor.formato})" if escritor else ""))
+
+if __name__ == "__main__":
+    main()
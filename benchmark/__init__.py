@@ -0,0 +1 @@
+"""Benchmarks reprodutíveis dos solvers sobre redes sintéticas"""
@@ -0,0 +1,207 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import csv  # Importa o módulo csv para a saída tabular
+import json  # Importa o módulo json para a saída estruturada
+import os  # Importa o módulo os para manipular caminhos
+import platform  # Importa o módulo platform para registrar o ambiente
+import subprocess  # Importa o módulo subprocess para consultar a revisão do git
+import tempfile  # Importa o módulo tempfile para as planilhas e caches temporários
+import time  # Importa o módulo time para medir o tempo de execução
+import tracemalloc  # Importa o módulo tracemalloc para medir o pico de memória
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import scipy  # Importa o SciPy para registrar a versão
+from comum.barras import bus_arrays  # Vetores das barras
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.fluxos import calculate_power_flows  # Pós-processamento vetorizado
+from comum.ybus import branch_arrays, build_ybus  # Vetores dos ramos e montagem da Ybus
+from analises.ilhas import solve_islands  # Solução por ilha com reordenação de barras
+from metodo_desacoplado_rapido.fast_decoupled import fast_decoupled_power_flow  # Solver desacoplado rápido
+from metodo_gauss_seidel.lib.gauss_seidel import solve_power_flow  # Solver Gauss-Seidel
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+from .gerador import TOPOLOGIAS, synthetic_grid, write_case  # Redes sintéticas
+
+TOLERANCIA = 1e-6  # Tolerância comum a todos os motores
+FASES = ("carga_fria", "carga_cache", "ybus", "solucao", "pos")  # Fases cronometradas de cada execução
+FASES_CARGA = FASES[:2]  # Fases de carga: iguais para todos os motores, medidas uma vez por caso
+
+def _nr(Ybus, barras, ramos):
+    return newton_raphson_power_flow(Ybus, barras, tol=TOLERANCIA)
+
+def _nr_gmres(Ybus, barras, ramos):
+    return newton_raphson_power_flow(Ybus, barras, tol=TOLERANCIA, linear="gmres")
+
+def _nr_livre(Ybus, barras, ramos):
+    return newton_raphson_power_flow(Ybus, barras, tol=TOLERANCIA, linear="bicgstab", jacobiana="livre")
+
+def _nr_ilhas(Ybus, barras, ramos):
+    return solve_islands(Ybus, barras, ramos, "nr", tol=TOLERANCIA)[:3]
+
+def _nr_laco(Ybus, barras, ramos):
+    return newton_raphson_power_flow(Ybus, barras, tol=TOLERANCIA, modo="laco")
+
+def _gs(Ybus, barras, ramos):
+    return solve_power_flow(Ybus, barras, ramos, erro_max=TOLERANCIA, K_max=100000)[:3]
+
+def _gs_laco(Ybus, barras, ramos):
+    with np.errstate(all="ignore"):  # O laço original pode divergir até NaN; o resultado é marcado como não convergido
+        return solve_power_flow(Ybus, barras, ramos, erro_max=TOLERANCIA, K_max=100000, modo="laco")[:3]
+
+def _fdlf(Ybus, barras, ramos):
+    return fast_decoupled_power_flow(Ybus, barras, ramos, tol=TOLERANCIA)
+
+# Motores comparados: nome -> (função (Ybus, barras, ramos) -> (V, iterações, erro), maior caso em barras)
+# Novos solvers entram aqui; os motores originais elemento a elemento ficam restritos a casos pequenos.
+MOTORES = {
+    "nr": (_nr, None),
+    "nr_gmres": (_nr_gmres, None),
+    "nr_livre": (_nr_livre, None),
+    "nr_ilhas": (_nr_ilhas, None),
+    "nr_laco": (_nr_laco, 300),
+    "fdlf": (_fdlf, None),
+    "gs": (_gs, None),
+    "gs_laco": (_gs_laco, 150),
+}
+
+def load_times(barras_tab, impedancias_tab, repeticoes=3):
+    """Menores tempos de carga do caso gravado em planilhas: frio (Excel, sem cache) e pelo cache .npz
+
+    O caminho frio usa uma pasta de cache nova a cada repetição, de modo que load_case lê as planilhas,
+    monta a Ybus e grava o cache; a carga seguinte, na mesma pasta, mede o caminho quente.
+    """
+    melhores = dict.fromkeys(FASES_CARGA, np.inf)
+    with tempfile.TemporaryDirectory() as pasta:
+        write_case(barras_tab, impedancias_tab, pasta)  # Planilhas no leiaute de dados_excel/
+        fontes = (os.path.join(pasta, "Barras.xlsx"), os.path.join(pasta, "impedância.xlsx"))
+        for k in range(max(repeticoes, 1)):
+            cache = os.path.join(pasta, f".cache{k}")  # Pasta de cache vazia: força o caminho frio
+            t0 = time.perf_counter()
+            load_case(*fontes, cache_dir=cache)
+            t1 = time.perf_counter()
+            load_case(*fontes, cache_dir=cache)
+            t2 = time.perf_counter()
+            melhores = {'carga_fria': min(melhores['carga_fria'], t1 - t0), 'carga_cache': min(melhores['carga_cache'], t2 - t1)}
+    return melhores
+
+def _execucao(motor, barras, ramos, n):
+    """Executa as fases de um caso já carregado e devolve os tempos de cada fase e a solução"""
+    t1 = time.perf_counter()
+    Ybus = build_ybus(ramos, n)  # Matriz de admitância
+    t2 = time.perf_counter()
+    V, iteracoes, erro = MOTORES[motor][0](Ybus, barras, ramos)  # Solução do fluxo de carga
+    t3 = time.perf_counter()
+    with np.errstate(all="ignore"):  # Não emite avisos para soluções divergentes
+        calculate_power_flows(V, Ybus, barras, ramos)  # Injeções, fluxos e perdas
+    t4 = time.perf_counter()
+    tempos = dict(ybus=t2 - t1, solucao=t3 - t2, pos=t4 - t3)
+    convergiu = bool(erro < TOLERANCIA and np.all(np.isfinite(V)))  # Solução divergente pode ter erro NaN
+    return tempos, int(iteracoes), float(erro), convergiu
+
+def benchmark_case(motor, topologia, n_barras, semente=0, repeticoes=3, memoria=True, cargas=None):
+    """Mede um motor em uma rede sintética: menor tempo de cada fase, iterações, erro e pico de memória
+
+    cargas (opcional) são os tempos de load_times já medidos para a rede, reaproveitados entre os motores.
+    """
+    barras_tab, impedancias_tab = synthetic_grid(n_barras, topologia, semente)  # Rede sintética
+    cargas = cargas if cargas is not None else load_times(barras_tab, impedancias_tab, repeticoes)
+    barras, ramos = bus_arrays(barras_tab), branch_arrays(impedancias_tab)  # Os mesmos vetores que load_case devolve
+    melhores = dict(cargas, **dict.fromkeys(FASES[2:], np.inf))
+    for _ in range(max(repeticoes, 1)):
+        tempos, iteracoes, erro, convergiu = _execucao(motor, barras, ramos, n_barras)
+        melhores.update({f: min(melhores[f], tempos[f]) for f in tempos})  # Menor tempo: menos sensível a ruído do sistema
+    pico = None
+    if memoria:  # Execução separada: o rastreamento de alocações distorce os tempos
+        tracemalloc.start()
+        _execucao(motor, barras, ramos, n_barras)
+        pico = tracemalloc.get_traced_memory()[1] / 2**20  # Pico das alocações Python/NumPy (MB)
+        tracemalloc.stop()
+    return {
+        "motor": motor,
+        "topologia": topologia,
+        "n_barras": int(n_barras),
+        "n_ramos": len(impedancias_tab["DE"]),
+        "semente": semente,
+        "tempos": melhores,
+        "tempo_total": sum(melhores[f] for f in FASES if f != "carga_fria"),  # Execução típica: caso já em cache
+        "iteracoes": iteracoes,
+        "erro": erro,
+        "convergiu": convergiu,
+        "pico_memoria_mb": pico,
+    }
+
+def environment():
+    """Ambiente da execução, para comparar resultados ao longo do tempo"""
+    try:
+        revisao = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        revisao = None
+    return {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revisao": revisao,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+def run_benchmarks(tamanhos, topologias=TOPOLOGIAS, motores=None, semente=0, repeticoes=3, memoria=True):
+    """Percorre tamanhos, topologias e motores; devolve o ambiente e a lista de medições"""
+    resultados = []
+    for topologia in topologias:
+        for n in tamanhos:
+            cargas = load_times(*synthetic_grid(n, topologia, semente), repeticoes)  # Uma medição de carga por rede
+            for motor in motores or MOTORES:
+                limite = MOTORES[motor][1]
+                if limite is not None and n > limite:
+                    continue  # Motor elemento a elemento: caso grande demais
+                resultado = benchmark_case(motor, topologia, n, semente, repeticoes, memoria, cargas)
+                resultados.append(resultado)
+                print(f"{topologia:>8} {n:>7} {motor:>8} {resultado['iteracoes']:>6} {resultado['erro']:>10.2e} "
+                      + f"{'sim' if resultado['convergiu'] else 'não':>4} "
+                      + " ".join(f"{resultado['tempos'][f]:>11.4f}" for f in FASES)
+                      + (f" {resultado['pico_memoria_mb']:>9.1f}" if memoria else ""))
+    return {"ambiente": environment(), "resultados": resultados}
+
+def write_results(relatorio, caminho):
+    """Grava as medições em JSON (completo) ou CSV (uma linha por medição)"""
+    if caminho.endswith(".csv"):
+        campos = ["motor", "topologia", "n_barras", "n_ramos", "semente", "iteracoes", "erro", "convergiu",
+                  "pico_memoria_mb"] + [f"tempo_{f}" for f in FASES] + ["tempo_total"]
+        with open(caminho, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=campos)
+            escritor.writeheader()
+            for r in relatorio["resultados"]:
+                linha = {c: r[c] for c in campos if c in r}
+                linha.update({f"tempo_{f}": r["tempos"][f] for f in FASES})
+                escritor.writerow(linha)
+    else:
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos solvers de fluxo de carga em redes sintéticas")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[14, 118, 1000, 10000], help="Números de barras")
+    parser.add_argument("--topologias", nargs="+", default=list(TOPOLOGIAS), choices=TOPOLOGIAS, help="Topologias das redes")
+    parser.add_argument("--motores", nargs="+", default=list(MOTORES), choices=list(MOTORES), help="Motores comparados")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do gerador de redes")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições por medição (vale o menor tempo)")
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória")
+    parser.add_argument("--casos", default=None, help="Pasta onde gravar as redes geradas como planilhas")
+    parser.add_argument("--saida", default="benchmark.json", help="Arquivo de saída (.json ou .csv)")
+    args = parser.parse_args()
+
+    if args.casos:  # Planilhas no leiaute de dados_excel/, utilizáveis pelos programas principais
+        for topologia in args.topologias:
+            for n in args.tamanhos:
+                write_case(*synthetic_grid(n, topologia, args.semente), os.path.join(args.casos, f"{topologia}_{n}"))
+
+    print(f"{'rede':>8} {'barras':>7} {'motor':>8} {'iter':>6} {'erro':>10} {'conv':>4} "
+          + " ".join(f"{f:>11}" for f in FASES) + ("" if args.sem_memoria else f" {'pico MB':>9}"))
+    relatorio = run_benchmarks(args.tamanhos, args.topologias, args.motores, args.semente, args.repeticoes,
+                               not args.sem_memoria)
+    write_results(relatorio, args.saida)
+    print(f"\nResultados salvos em {args.saida}")
+
+if __name__ == "__main__":
+    main()
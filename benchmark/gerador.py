@@ -0,0 +1,104 @@
+import os  # Importa o módulo os para manipular caminhos
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from scipy.sparse.csgraph import breadth_first_order, minimum_spanning_tree  # Árvore geradora e profundidade dos alimentadores
+from scipy.spatial import cKDTree  # Vizinhos mais próximos no plano
+
+TOPOLOGIAS = ("malhada", "radial")  # Tipos de rede sintética
+FATOR_DESPACHO = 1.005  # Geração regional em relação à carga (cobre as perdas; a slack fecha só o resíduo)
+
+def _spanning_edges(pontos, k):
+    """Árvore geradora mínima (por distância) do grafo dos k vizinhos mais próximos"""
+    n = len(pontos)
+    dist, viz = cKDTree(pontos).query(pontos, k=min(k + 1, n))  # Primeiro vizinho é a própria barra
+    linhas = np.repeat(np.arange(n), viz.shape[1] - 1)
+    grafo = sparse.coo_matrix((dist[:, 1:].ravel() + 1e-12, (linhas, viz[:, 1:].ravel())), shape=(n, n))
+    arvore = minimum_spanning_tree(grafo.tocsr()).tocoo()
+    if arvore.nnz < n - 1:  # Grafo de vizinhos desconexo: amplia a vizinhança
+        return _spanning_edges(pontos, 2 * k)
+    return arvore.row, arvore.col
+
+def synthetic_grid(n_barras, topologia="malhada", semente=0, ramos_por_barra=1.4):
+    """Gera uma rede sintética no mesmo esquema de Barras.xlsx e impedância.xlsx
+
+    As barras são distribuídas no plano e ligadas pela árvore geradora mínima dos vizinhos mais próximos
+    (rede quase planar, como as redes reais); a rede malhada recebe ramos extras entre vizinhos próximos
+    até `ramos_por_barra`, e a radial é alimentada apenas pela subestação (barra 1).
+    Devolve (barras, impedancias) como dicionários de vetores com as colunas das planilhas.
+    """
+    if topologia not in TOPOLOGIAS:
+        raise ValueError(f"Topologia desconhecida: {topologia}")
+    rng = np.random.default_rng(semente)  # Gerador reprodutível
+    n = int(n_barras)
+    pontos = rng.random((n, 2))  # Coordenadas das barras
+    de, para = _spanning_edges(pontos, 6)  # Árvore geradora
+    if topologia == "malhada":
+        extras = int(round((ramos_por_barra - 1) * n)) + 1  # Ramos extras para atingir a densidade desejada
+        _, viz = cKDTree(pontos).query(pontos, k=min(4, n))
+        candidatos = np.stack([np.repeat(np.arange(n), viz.shape[1] - 1), viz[:, 1:].ravel()], axis=1)
+        candidatos = np.unique(np.sort(candidatos, axis=1), axis=0)  # Pares de vizinhos sem repetição
+        existentes = set(zip(*np.sort(np.stack([de, para]), axis=0)))
+        candidatos = np.array([c for c in candidatos if tuple(c) not in existentes]).reshape(-1, 2)
+        escolha = rng.choice(len(candidatos), min(extras, len(candidatos)), replace=False)
+        de = np.concatenate([de, candidatos[escolha, 0]])
+        para = np.concatenate([para, candidatos[escolha, 1]])
+    m = len(de)  # Número de ramos
+    comprimento = np.linalg.norm(pontos[de] - pontos[para], axis=1) * np.sqrt(n)  # Comprimento relativo ao espaçamento médio
+    comprimento = np.clip(comprimento, 0.5, 2.0)  # Evita ramos quase ideais e ligações muito fracas
+
+    tipo = np.zeros(n, dtype=np.int64)  # Todas PQ
+    tipo[0] = 1  # Barra 1 é a slack (subestação na rede radial)
+    if topologia == "malhada":
+        alivio = min(1.0, np.sqrt(300 / n))  # Redes grandes mais leves: limita a abertura angular acumulada
+        x = rng.uniform(0.03, 0.12, m) * comprimento  # Reatâncias de transmissão (pu)
+        r = x * rng.uniform(0.08, 0.3, m)  # Relação R/X de transmissão
+        b_meia = x * rng.uniform(0.02, 0.1, m) * alivio ** 2  # Carregamento das linhas, compensado nas redes grandes
+        carga = rng.uniform(0, 10, n) * alivio  # Cargas ativas (MW)
+        carga[0] = 0  # Slack sem carga
+        fp = rng.uniform(0.1, 0.3, n)  # Relação Q/P das cargas
+        geradores = rng.choice(np.arange(1, n), max(n // 5, 1 if n > 1 else 0), replace=False)  # 20% das barras com geração
+        tipo[geradores] = 2
+        geracao = np.zeros(n)
+        if len(geradores):
+            regiao = geradores[cKDTree(pontos[geradores]).query(pontos)[1]]  # Gerador mais próximo de cada barra
+            geracao += FATOR_DESPACHO * np.bincount(regiao, weights=carga, minlength=n)  # Cada gerador atende a carga da sua região
+        v = np.where(tipo > 0, rng.uniform(1.005, 1.015, n), 1.0)  # Tensões especificadas próximas da partida plana
+    else:
+        x = rng.uniform(0.002, 0.006, m) * comprimento  # Alimentadores de distribuição (pu na base do sistema)
+        r = x * rng.uniform(0.8, 2.0, m)  # Relação R/X de distribuição
+        b_meia = np.zeros(m)
+        ordem, pais = breadth_first_order(sparse.coo_matrix((np.ones(m), (de, para)), shape=(n, n)), 0, directed=False)
+        profundidade = np.zeros(n)
+        for i in ordem[1:]:
+            profundidade[i] = profundidade[pais[i]] + 1  # Número de trechos até a subestação
+        carga = rng.uniform(0, 1, n) * 300 / (n * max(profundidade.max(), 1))  # Carga limitada pela profundidade do alimentador
+        carga[0] = 0  # Subestação sem carga
+        fp = rng.uniform(0.3, 0.5, n)  # Relação Q/P das cargas
+        geracao = np.zeros(n)
+        v = np.where(tipo > 0, 1.03, 1.0)  # Tensão na saída da subestação
+    barras = {
+        "TIPO DE BARRA": tipo,
+        "VOLTAGE MAGNITUDE": v,
+        "ANGLE DEGRESS": np.zeros(n),
+        "LOAD (MW)": carga,
+        "LOAD (MVAR)": carga * fp,
+        "GENERATOR (MW)": geracao,
+        "GENERATOR (MVAR)": np.zeros(n),
+    }
+    impedancias = {
+        "DE": de + 1,
+        "PARA": para + 1,
+        "RESISTÊNCIA": r,
+        "REATÂNCIA": x,
+        "MEIA SUSCEPTÂNCIA": b_meia,
+    }
+    return barras, impedancias
+
+def write_case(barras, impedancias, pasta):
+    """Grava a rede sintética como Barras.xlsx e impedância.xlsx (mesmo leiaute de dados_excel/)"""
+    import pandas as pd  # Importação local: só a gravação em Excel precisa do pandas
+    os.makedirs(pasta, exist_ok=True)
+    pd.DataFrame(barras).set_index("TIPO DE BARRA").to_excel(os.path.join(pasta, "Barras.xlsx"))
+    tabela = pd.DataFrame(impedancias)
+    tabela.index = [None] * len(tabela)  # Primeira coluna vazia, como na planilha original
+    tabela.to_excel(os.path.join(pasta, "impedância.xlsx"))
@@ -0,0 +1 @@
+"""Módulos compartilhados entre os métodos de fluxo de carga"""
@@ -0,0 +1,35 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+
+S_BASE = 100  # Potência base do sistema (MVA)
+
+def bus_arrays(tipo_barras):
+    """Extrai os vetores das barras (tipo, tensão e potências em pu)"""
+    if 'tipo' in tipo_barras:
+        return tipo_barras  # Dados já extraídos
+    colunas = tipo_barras.keys()  # Colunas disponíveis (DataFrame ou dicionário de vetores)
+    if "TIPO DE BARRA" in colunas:
+        tipo = np.asarray(tipo_barras["TIPO DE BARRA"], dtype=np.int64)  # Tipo informado em coluna
+    else:
+        tipo = np.asarray(tipo_barras.index, dtype=np.int64)  # Tipo informado no índice da planilha
+    v = np.asarray(tipo_barras["VOLTAGE MAGNITUDE"], dtype=float)  # Módulos de tensão especificados
+    p_carga = np.asarray(tipo_barras["LOAD (MW)"], dtype=float) / S_BASE  # Carga ativa (pu)
+    q_carga = np.asarray(tipo_barras["LOAD (MVAR)"], dtype=float) / S_BASE  # Carga reativa (pu)
+    p_ger = np.asarray(tipo_barras["GENERATOR (MW)"], dtype=float) / S_BASE  # Geração ativa (pu)
+    q_ger = np.asarray(tipo_barras["GENERATOR (MVAR)"], dtype=float) / S_BASE  # Geração reativa (pu)
+    return {
+        'tipo': tipo,  # 0 = PQ, 1 = Slack, 2 = PV
+        'v': v,  # Tensões especificadas (pu)
+        'p': p_ger - p_carga,  # Potências ativas líquidas (pu)
+        'q': q_ger - q_carga,  # Potências reativas líquidas (pu)
+        'p_carga': p_carga,  # Cargas ativas (pu)
+        'q_carga': q_carga  # Cargas reativas (pu)
+    }
+
+def initial_voltage(barras, V0=None):
+    """Módulos e ângulos iniciais: partida plana ou partida a quente a partir de V0"""
+    V = barras['v'].astype(float)  # Módulos especificados
+    if V0 is None:
+        return V, np.zeros(len(V))  # Partida plana
+    V0 = np.asarray(V0)  # Tensões complexas da solução anterior
+    V[barras['tipo'] == 0] = np.abs(V0[barras['tipo'] == 0])  # Barras PQ herdam o módulo anterior
+    return V, np.angle(V0)  # Ângulos herdados da solução anterior
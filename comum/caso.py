@@ -0,0 +1,89 @@
+import hashlib  # Importa o módulo hashlib para o hash do conteúdo das planilhas
+import os  # Importa o módulo os para manipular caminhos e datas de modificação
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from .barras import bus_arrays  # Extração dos vetores das barras
+from .rastreio import medir  # Medição opcional das fases
+from .ybus import branch_arrays, build_ybus  # Vetores dos ramos e montagem da Ybus esparsa
+
+VERSAO = 1  # Versão do formato do cache; alterar invalida os caches existentes
+
+def _file_hash(filepath):
+    """Hash SHA-256 do conteúdo de um arquivo"""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def _cache_path(fontes, cache_dir):
+    """Caminho do arquivo de cache de um par de planilhas"""
+    chave = hashlib.sha1("|".join(os.path.abspath(f) for f in fontes).encode("utf-8")).hexdigest()[:16]  # Identifica o par de planilhas
+    return os.path.join(cache_dir, f"caso_{chave}.npz")
+
+def _parse_excel(barras_path, impedancias_path, observador=None):
+    """Lê as planilhas (caminho frio) e extrai barras, ramos e Ybus"""
+    with medir(observador, "carga"):
+        import pandas as pd  # Importação local: só o caminho frio precisa do pandas/openpyxl
+        try:
+            tipo_barras = pd.read_excel(barras_path, index_col=0, header=0)  # Dados das barras
+            impedancias = pd.read_excel(impedancias_path, index_col=0, header=0)  # Dados dos ramos
+        except Exception as e:
+            raise Exception(f"Erro ao carregar planilhas do caso: {e}")
+        barras = bus_arrays(tipo_barras)  # Vetores das barras
+        ramos = branch_arrays(impedancias)  # Vetores dos ramos
+    with medir(observador, "ybus"):
+        Ybus = build_ybus(ramos, len(barras['tipo']))  # Matriz de admitância esparsa
+    return {'barras': barras, 'ramos': ramos, 'Ybus': Ybus}
+
+def _save(cache_path, caso, fontes, mtimes, hashes):
+    """Grava o caso compilado de forma atômica"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    Y = caso['Ybus']
+    vetores = {f"barras_{k}": v for k, v in caso['barras'].items()}
+    vetores.update({f"ramos_{k}": v for k, v in caso['ramos'].items()})
+    vetores.update(ybus_data=Y.data, ybus_indices=Y.indices, ybus_indptr=Y.indptr, ybus_shape=np.array(Y.shape))
+    vetores.update(versao=np.array(VERSAO), fonte_mtime=np.array(mtimes), fonte_hash=np.array(hashes))
+    temporario = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez(arquivo, **vetores)
+    os.replace(temporario, cache_path)  # Troca atômica: leitores nunca veem um cache incompleto
+
+def _from_npz(dados):
+    """Reconstrói o caso a partir do arquivo compilado"""
+    barras = {k[7:]: dados[k] for k in dados.files if k.startswith("barras_")}
+    ramos = {k[6:]: dados[k] for k in dados.files if k.startswith("ramos_")}
+    Ybus = sparse.csr_matrix((dados["ybus_data"], dados["ybus_indices"], dados["ybus_indptr"]),
+                             shape=tuple(dados["ybus_shape"]))
+    return {'barras': barras, 'ramos': ramos, 'Ybus': Ybus}
+
+def load_case(barras_path, impedancias_path, cache_dir=None, observador=None):
+    """Carrega o caso (barras, ramos e Ybus) usando um cache binário .npz
+
+    O cache é válido enquanto as datas de modificação das planilhas não mudarem; se mudarem,
+    o hash do conteúdo decide se o caso precisa ser recompilado a partir do Excel.
+    observador (opcional) mede as fases carga e ybus (ver comum.rastreio); a Ybus lida do cache conta como carga.
+    """
+    fontes = [barras_path, impedancias_path]  # Planilhas de origem
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(barras_path)), ".cache")  # Pasta do cache
+    cache_path = _cache_path(fontes, cache_dir)
+    mtimes = [os.path.getmtime(f) for f in fontes]  # Datas de modificação atuais
+    hashes = None
+    with medir(observador, "carga"):
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as dados:
+                    if int(dados["versao"]) == VERSAO:
+                        if list(dados["fonte_mtime"]) == mtimes:
+                            return _from_npz(dados)  # Caminho quente: nenhuma planilha foi modificada
+                        hashes = [_file_hash(f) for f in fontes]
+                        if list(dados["fonte_hash"]) == hashes:
+                            caso = _from_npz(dados)  # Conteúdo igual: só atualiza as datas registradas
+                            _save(cache_path, caso, fontes, mtimes, hashes)
+                            return caso
+            except (OSError, ValueError, KeyError):
+                pass  # Cache corrompido ou incompleto: recompila
+    caso = _parse_excel(barras_path, impedancias_path, observador)  # Caminho frio
+    with medir(observador, "carga"):
+        _save(cache_path, caso, fontes, mtimes, hashes or [_file_hash(f) for f in fontes])
+    return caso
@@ -0,0 +1,88 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from .barras import bus_arrays  # Extração dos vetores das barras
+from .newton import power_injections  # Potências injetadas S = V·conj(Ybus·V)
+from .ybus import branch_admittances, branch_arrays  # Modelo π e vetores dos ramos
+
+CAMPOS_BARRAS = ('V', 'P_gerada', 'Q_gerada', 'P_injetada', 'Q_injetada')  # Colunas por barra
+CAMPOS_RAMOS = ('fluxos_ativos', 'fluxos_reativos', 'fluxos_ativos_para', 'fluxos_reativos_para',
+                'perdas_ativas', 'perdas_reativas')  # Colunas por ramo
+
+class PowerFlowResults:
+    """Resultados em colunas: cada campo é um vetor (instantes x barras) ou (instantes x ramos)
+
+    O armazenamento cresce em blocos de `capacidade` instantes, sem realocar os blocos anteriores: os instantes
+    devolvidos por snapshot (e por calculate_power_flows) continuam sendo views dos dados guardados. Informe a
+    capacidade esperada para que a coluna completa seja uma view de um único bloco; com vários blocos ela é uma
+    cópia concatenada.
+    """
+
+    def __init__(self, n_barras, n_ramos, capacidade=1):
+        self.n_barras = n_barras  # Número de barras
+        self.n_ramos = n_ramos  # Número de ramos
+        self.n_instantes = 0  # Instantes já preenchidos
+        self.capacidade = max(int(capacidade), 1)  # Instantes por bloco
+        self._blocos = []  # Blocos de colunas, cada um com `capacidade` instantes
+
+    def _novo_bloco(self):
+        dados = {c: np.empty((self.capacidade, self.n_barras), dtype=complex if c == 'V' else float) for c in CAMPOS_BARRAS}
+        dados.update({c: np.empty((self.capacidade, self.n_ramos)) for c in CAMPOS_RAMOS})
+        self._blocos.append(dados)
+
+    def new_snapshot(self):
+        """Reserva o próximo instante e devolve seu índice"""
+        if self.n_instantes == len(self._blocos) * self.capacidade:  # Sem espaço: acrescenta um bloco
+            self._novo_bloco()
+        self.n_instantes += 1
+        return self.n_instantes - 1
+
+    def snapshot(self, k):
+        """Campos do instante k (views de uma linha de cada coluna)"""
+        bloco, linha = divmod(k, self.capacidade)
+        return {c: v[linha] for c, v in self._blocos[bloco].items()}
+
+    def __getitem__(self, campo):
+        """Coluna completa de um campo (view se os instantes preenchidos cabem num bloco, senão cópia)"""
+        if not self._blocos:
+            self._novo_bloco()  # Ainda sem instantes: coluna vazia com a forma e o tipo certos
+        if len(self._blocos) == 1:
+            return self._blocos[0][campo][:self.n_instantes]
+        resto = self.n_instantes - (len(self._blocos) - 1) * self.capacidade  # Instantes preenchidos no último bloco
+        return np.concatenate([b[campo] for b in self._blocos[:-1]] + [self._blocos[-1][campo][:resto]])
+
+    def __len__(self):
+        return self.n_instantes
+
+def branch_flows(V, ramos, adm=None):
+    """Potências complexas entrando em cada ramo pelos lados DE e PARA (modelo π com tap e carregamento)"""
+    yff, yft, ytf, ytt = adm if adm is not None else branch_admittances(ramos)  # Admitâncias do modelo π
+    Vf, Vt = V[..., ramos['de']], V[..., ramos['para']]  # Tensões terminais (aceita vários instantes)
+    S_de = Vf * np.conj(yff * Vf + yft * Vt)  # Potência entrando pelo lado DE
+    S_para = Vt * np.conj(ytf * Vf + ytt * Vt)  # Potência entrando pelo lado PARA
+    return S_de, S_para
+
+def calculate_power_flows(vetor_tensao, matriz_admt, tipo_barras, impedancias, resultados=None):
+    """Calcula injeções nas barras, fluxos e perdas nos ramos de forma vetorizada
+
+    Sem `resultados`, devolve os campos de um único instante; com um PowerFlowResults, grava o instante nele.
+    """
+    barras = bus_arrays(tipo_barras)  # Vetores das barras
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    V = np.asarray(vetor_tensao, dtype=complex)  # Tensões complexas
+    if resultados is None:
+        resultados = PowerFlowResults(len(V), len(ramos['de']))
+    linha = resultados.snapshot(resultados.new_snapshot())  # Views do novo instante
+    S = power_injections(matriz_admt, V)  # Potências líquidas injetadas
+    S_de, S_para = branch_flows(V, ramos)  # Fluxos nos dois extremos de cada ramo
+    perdas = S_de + S_para  # Perdas série menos a geração reativa do carregamento das linhas
+    linha['V'][:] = V
+    linha['P_gerada'][:] = S.real + barras['p_carga']  # Geração = injeção líquida + carga
+    linha['Q_gerada'][:] = S.imag + barras['q_carga']
+    linha['P_injetada'][:] = S.real  # Injeção líquida (geração - carga)
+    linha['Q_injetada'][:] = S.imag
+    linha['fluxos_ativos'][:] = S_de.real
+    linha['fluxos_reativos'][:] = S_de.imag
+    linha['fluxos_ativos_para'][:] = S_para.real
+    linha['fluxos_reativos_para'][:] = S_para.imag
+    linha['perdas_ativas'][:] = perdas.real
+    linha['perdas_reativas'][:] = perdas.imag
+    return linha
@@ -0,0 +1,131 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from scipy.sparse.linalg import LinearOperator, bicgstab, gmres, spilu, splu  # Fatorações e solvers iterativos esparsos
+
+KRYLOV = ("gmres", "bicgstab")  # Solvers iterativos disponíveis para a correção de Newton
+ORDENACOES_LU = ("mmd", "natural")  # Ordenação da LU: grau mínimo do SuperLU ou a ordem das barras
+
+def power_injections(Ybus, V):
+    """Calcula as potências complexas injetadas S = V·conj(Ybus·V)"""
+    return V * np.conj(Ybus @ V)
+
+def dS_dV(Ybus, V):
+    """Derivadas parciais de S em relação ao ângulo e ao módulo da tensão"""
+    I = Ybus @ V  # Correntes injetadas
+    diag_V = sparse.diags(V)  # diag(V)
+    diag_I = sparse.diags(I)  # diag(I)
+    diag_Vnorm = sparse.diags(V / np.abs(V))  # diag(V/|V|)
+    dS_dVa = 1j * diag_V @ np.conj(diag_I - Ybus @ diag_V)  # dS/dθ
+    dS_dVm = diag_V @ np.conj(Ybus @ diag_Vnorm) + np.conj(diag_I) @ diag_Vnorm  # dS/d|V|
+    return dS_dVa.tocsr(), dS_dVm.tocsr()
+
+def build_jacobian(Ybus, V, pvpq, pq):
+    """Monta a Jacobiana esparsa [dP/dθ dP/dV; dQ/dθ dQ/dV] para as barras informadas"""
+    dS_dVa, dS_dVm = dS_dV(Ybus, V)  # Derivadas de S
+    dVa_pvpq = dS_dVa[pvpq]  # Linhas das equações de P
+    dVa_pq = dS_dVa[pq]  # Linhas das equações de Q
+    dVm_pvpq = dS_dVm[pvpq]
+    dVm_pq = dS_dVm[pq]
+    return sparse.bmat([
+        [dVa_pvpq[:, pvpq].real, dVm_pvpq[:, pq].real],
+        [dVa_pq[:, pvpq].imag, dVm_pq[:, pq].imag]
+    ], format="csc")
+
+def mismatch(Ybus, V, S_esp, pvpq, pq):
+    """Vetor de resíduos [ΔP(pvpq); ΔQ(pq)]"""
+    dS = S_esp - power_injections(Ybus, V)  # Resíduo de potência complexa
+    return np.concatenate([dS.real[pvpq], dS.imag[pq]])
+
+def jacobian_free_operator(Ybus, Vm, Va, S_esp, pvpq, pq, residuo):
+    """Jacobiana como LinearOperator: J·v por diferença finita dos resíduos em torno de (Va, Vm), sem montar J
+
+    residuo é mismatch no ponto atual; como mismatch = S_esp - S, J·v = (residuo - mismatch(x + ε·v)) / ε.
+    """
+    n_theta = len(pvpq)
+    x = np.concatenate([Va[pvpq], Vm[pq]])  # Variáveis de estado atuais
+    escala = np.sqrt(np.finfo(float).eps) * (1 + np.linalg.norm(x))  # Passo relativo ao tamanho do estado
+    def produto(v):
+        v = np.ravel(v)
+        norma = np.linalg.norm(v)
+        if norma == 0:
+            return np.zeros_like(residuo)
+        eps = escala / norma
+        Va_p, Vm_p = Va.copy(), Vm.copy()
+        Va_p[pvpq] += eps * v[:n_theta]
+        Vm_p[pq] += eps * v[n_theta:]
+        return (residuo - mismatch(Ybus, Vm_p * np.exp(1j * Va_p), S_esp, pvpq, pq)) / eps
+    return LinearOperator((len(residuo), len(residuo)), matvec=produto, dtype=float)
+
+def factorize(A, ordem=None):
+    """Fatoração LU esparsa com ordenação de grau mínimo em A^T+A
+
+    As matrizes do fluxo de carga têm estrutura simétrica e diagonal dominante,
+    então o pivoteamento prioriza a diagonal para preservar a ordenação e limitar o preenchimento.
+    ordem (opcional) é uma permutação já calculada (ex.: barras reordenadas por comum.topologia.bus_ordering):
+    a matriz é fatorada nessa ordem, sem recalcular o grau mínimo a cada fatoração.
+    """
+    if ordem is None:
+        return splu(sparse.csc_matrix(A), permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.1,
+                    options=dict(SymmetricMode=True))
+    return _PermutedLU(splu(sparse.csc_matrix(A)[ordem][:, ordem], permc_spec="NATURAL", diag_pivot_thresh=0.1,
+                            options=dict(SymmetricMode=True)), ordem)
+
+class _PermutedLU:
+    """LU de A[ordem][:, ordem] que resolve sistemas em A"""
+
+    def __init__(self, lu, ordem):
+        self.lu = lu  # Fatoração da matriz permutada
+        self.ordem = ordem  # Posição original de cada linha/coluna permutada
+        self.shape = lu.shape
+
+    def solve(self, b):
+        y = self.lu.solve(np.asarray(b)[self.ordem])  # Solução na ordem permutada
+        x = np.empty_like(y)
+        x[self.ordem] = y
+        return x
+
+def bus_order(barras_variaveis, ordenacao="mmd"):
+    """Permutação para factorize: None (grau mínimo) ou as variáveis em ordem de barra, com as de uma barra lado a lado
+
+    ordenacao="natural" é para casos cujas barras já foram reordenadas (comum.topologia.split_islands).
+    """
+    if ordenacao not in ORDENACOES_LU:
+        raise ValueError(f"Ordenação da fatoração desconhecida: {ordenacao}")
+    return np.argsort(barras_variaveis, kind="stable") if ordenacao == "natural" else None
+
+def ilu_preconditioner(A, drop_tol=1e-3, fill_factor=5):
+    """Pré-condicionador LU incompleto: descarta termos menores que drop_tol e limita o preenchimento a fill_factor·nnz(A)"""
+    ilu = spilu(sparse.csc_matrix(A), drop_tol=drop_tol, fill_factor=fill_factor, permc_spec="MMD_AT_PLUS_A",
+                diag_pivot_thresh=0.1, options=dict(SymmetricMode=True))
+    return LinearOperator(A.shape, matvec=ilu.solve, dtype=float)
+
+def forcing_term(eta_ant, norma, norma_ant, tol, gamma=0.9, alfa=2.0, eta_max=0.9):
+    """Termo forçante de Eisenstat-Walker (escolha 2): tolerância relativa do solver linear no Newton inexato
+
+    Longe da solução a correção é resolvida com folga; perto dela a tolerância acompanha a queda do resíduo.
+    O piso evita resolver o sistema linear com mais precisão do que a tolerância do Newton exige.
+    """
+    if norma_ant is None:
+        eta = 0.5  # Primeira iteração: solução linear frouxa
+    else:
+        eta = gamma * (norma / norma_ant) ** alfa
+        if gamma * eta_ant ** alfa > 0.1:  # Salvaguarda contra quedas bruscas do termo forçante
+            eta = max(eta, gamma * eta_ant ** alfa)
+    return float(min(max(eta, 0.5 * tol / norma), eta_max))
+
+def krylov_solve(A, b, M, metodo="gmres", rtol=1e-6, maxiter=500):
+    """Resolve A·x = b por GMRES (reinício a cada 50) ou BiCGStab pré-condicionados por M
+
+    A pode ser matriz esparsa ou LinearOperator. Devolve (x, iterações internas, info), com info = 0 na convergência.
+    """
+    contagem = [0]  # Iterações internas
+    def contar(*_):
+        contagem[0] += 1
+    if metodo == "gmres":
+        x, info = gmres(A, b, rtol=rtol, atol=0.0, restart=50, maxiter=max(maxiter // 50, 1), M=M,
+                        callback=contar, callback_type="pr_norm")
+    elif metodo == "bicgstab":
+        x, info = bicgstab(A, b, rtol=rtol, atol=0.0, maxiter=maxiter, M=M, callback=contar)
+    else:
+        raise ValueError(f"Solver iterativo desconhecido: {metodo}")
+    return x, contagem[0], info
@@ -0,0 +1,60 @@
+import json  # Importa o módulo json para exportar o rastreio
+import time  # Importa o módulo time para medir as fases
+from contextlib import contextmanager, nullcontext  # Gerenciadores de contexto das fases
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+
+class ConvergenceTrace:
+    """Observador opcional dos solvers: resíduo por iteração, barra pior e tempo por fase
+
+    Os solvers chamam `iteration` a cada iteração e `add_time` ao fim de cada fase medida
+    (residuos, jacobiana, fatoracao, solucao_linear); carga, ybus e pos são medidas com `medir`.
+    Qualquer objeto com iteration, add_time e fase serve de observador. `callback`, se informado,
+    recebe cada registro de iteração assim que é criado.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback  # Função chamada a cada iteração
+        self.iteracoes = []  # Registros por iteração
+        self.fases = {}  # Tempo acumulado por fase (s)
+
+    def add_time(self, fase, duracao):
+        """Acumula o tempo gasto em uma fase"""
+        self.fases[fase] = self.fases.get(fase, 0.0) + duracao
+
+    @contextmanager
+    def fase(self, nome):
+        """Mede o bloco como a fase `nome`"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(nome, time.perf_counter() - inicio)
+
+    def iteration(self, metodo, iteracao, residuo, barras, **extras):
+        """Registra uma iteração: maior resíduo, norma 2 e barra (1-based) onde o resíduo é máximo"""
+        residuo = np.abs(residuo)
+        pior = int(np.argmax(residuo)) if len(residuo) else 0
+        registro = {
+            'metodo': metodo,
+            'iteracao': int(iteracao),
+            'erro': float(residuo[pior]) if len(residuo) else 0.0,
+            'norma': float(np.linalg.norm(residuo)),
+            'barra': int(barras[pior]) + 1 if len(residuo) else None,
+        }
+        registro.update({k: v.item() if isinstance(v, np.generic) else v for k, v in extras.items()})
+        self.iteracoes.append(registro)
+        if self.callback is not None:
+            self.callback(registro)
+        return registro
+
+    def to_dict(self):
+        return {'fases': dict(self.fases), 'iteracoes': list(self.iteracoes)}
+
+    def export(self, caminho):
+        """Grava o rastreio em JSON"""
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+def medir(observador, fase):
+    """Contexto que mede `fase` no observador; sem observador, não faz nada"""
+    return nullcontext() if observador is None else observador.fase(fase)
@@ -0,0 +1,200 @@
+import glob  # Importa o módulo glob para localizar as partes do conjunto de dados
+import os  # Importa o módulo os para manipular caminhos
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from .barras import S_BASE  # Potência base do sistema
+from .fluxos import branch_flows  # Fluxos vetorizados nos ramos
+
+FORMATOS = ("auto", "parquet", "npz", "csv")  # Formatos de saída (auto: Parquet se pyarrow estiver instalado, senão NPZ)
+COLUNAS_BARRAS = ('instante', 'barra', 'V', 'angulo', 'P_injetada', 'Q_injetada')  # pu, graus, MW, MVAr (geração - carga)
+COLUNAS_RAMOS = ('instante', 'ramo', 'de', 'para', 'P_de', 'Q_de', 'P_para', 'Q_para', 'perdas_P', 'perdas_Q')  # MW, MVAr
+
+def _pyarrow():
+    """Módulo pyarrow (com pyarrow.parquet) ou None se não estiver instalado"""
+    try:
+        import pyarrow  # Importação local: dependência opcional
+        import pyarrow.parquet  # Submódulo de leitura e escrita Parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+class ResultWriter:
+    """Grava resultados de barras e ramos em colunas, em blocos, num conjunto de dados em disco
+
+    O conjunto é uma pasta com as tabelas `barras` e `ramos`. Os instantes ficam acumulados só até
+    `linhas_por_bloco` linhas por tabela e então são gravados: em Parquet, um grupo de linhas por bloco
+    num arquivo por sessão; em NPZ, um arquivo por bloco; em CSV, acrescentados ao mesmo arquivo.
+    Abrir de novo uma pasta existente acrescenta novas partes, sem reescrever as anteriores, e os instantes
+    continuam a partir do maior já gravado (instante_inicial fixa outro ponto de partida).
+    """
+
+    def __init__(self, pasta, ramos, formato="auto", linhas_por_bloco=100_000, instante_inicial=None):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de saída desconhecido: {formato}")
+        self.pa = _pyarrow()
+        if formato == "auto":
+            formato = "parquet" if self.pa is not None else "npz"
+        elif formato == "parquet" and self.pa is None:
+            raise ImportError("O formato Parquet exige o pacote pyarrow (use formato='npz' ou 'csv')")
+        self.pasta = pasta
+        self.formato = formato
+        self.ramos = ramos  # Vetores dos ramos (terminais)
+        self.linhas_por_bloco = linhas_por_bloco
+        self.instante = _next_instant(pasta) if instante_inicial is None else instante_inicial  # Número do próximo instante
+        self._buffer = {'barras': [], 'ramos': []}  # Colunas pendentes de cada tabela
+        self._linhas = {'barras': 0, 'ramos': 0}
+        self._parquet = {}  # Arquivos Parquet abertos na sessão
+        os.makedirs(pasta, exist_ok=True)
+        existentes = [os.path.basename(c).split("-")[1].split(".")[0] for c in glob.glob(os.path.join(pasta, "barras-*"))]
+        self._sessao = max((int(c) for c in existentes), default=-1) + 1  # Sessões anteriores não são reescritas
+
+    def append(self, resultados, instantes=None):
+        """Acrescenta um instante (campos de calculate_power_flows) ou vários (PowerFlowResults ou campos 2-D)"""
+        V = np.atleast_2d(np.asarray(resultados['V']))  # (instantes x barras)
+        k, n = V.shape
+        if instantes is None:
+            instantes = np.arange(self.instante, self.instante + k)
+        self.instante = int(np.max(instantes)) + 1
+        instantes = np.asarray(instantes, dtype=np.int64)
+        def campo(c):  # Coluna achatada na ordem (instante, elemento)
+            return np.atleast_2d(np.asarray(resultados[c])).ravel()
+        self._add('barras', {
+            'instante': np.repeat(instantes, n),
+            'barra': np.tile(np.arange(1, n + 1), k),
+            'V': np.abs(V).ravel(),
+            'angulo': np.degrees(np.angle(V)).ravel(),
+            'P_injetada': campo('P_injetada') * S_BASE,
+            'Q_injetada': campo('Q_injetada') * S_BASE,
+        })
+        m = len(self.ramos['de'])
+        self._add('ramos', {
+            'instante': np.repeat(instantes, m),
+            'ramo': np.tile(np.arange(1, m + 1), k),
+            'de': np.tile(self.ramos['de'] + 1, k),
+            'para': np.tile(self.ramos['para'] + 1, k),
+            'P_de': campo('fluxos_ativos') * S_BASE,
+            'Q_de': campo('fluxos_reativos') * S_BASE,
+            'P_para': campo('fluxos_ativos_para') * S_BASE,
+            'Q_para': campo('fluxos_reativos_para') * S_BASE,
+            'perdas_P': campo('perdas_ativas') * S_BASE,
+            'perdas_Q': campo('perdas_reativas') * S_BASE,
+        })
+
+    def append_voltages(self, V, Ybus, instantes=None):
+        """Acrescenta vários instantes a partir só das tensões (instantes x barras), calculando injeções e fluxos em lote
+
+        Grava a injeção líquida calculada de cada instante, que vale para qualquer perfil de cargas e gerações.
+        """
+        V = np.atleast_2d(np.asarray(V, dtype=complex))
+        S = (V.T * np.conj(Ybus @ V.T)).T  # Injeções de todos os instantes
+        S_de, S_para = branch_flows(V, self.ramos)
+        perdas = S_de + S_para
+        self.append({
+            'V': V, 'P_injetada': S.real, 'Q_injetada': S.imag,
+            'fluxos_ativos': S_de.real, 'fluxos_reativos': S_de.imag,
+            'fluxos_ativos_para': S_para.real, 'fluxos_reativos_para': S_para.imag,
+            'perdas_ativas': perdas.real, 'perdas_reativas': perdas.imag,
+        }, instantes)
+
+    def _add(self, tabela, colunas):
+        self._buffer[tabela].append(colunas)
+        self._linhas[tabela] += len(colunas['instante'])
+        if self._linhas[tabela] >= self.linhas_por_bloco:
+            self._flush(tabela)
+
+    def _flush(self, tabela):
+        """Grava as linhas pendentes de uma tabela como um bloco"""
+        if not self._buffer[tabela]:
+            return
+        nomes = COLUNAS_BARRAS if tabela == 'barras' else COLUNAS_RAMOS
+        bloco = {c: np.concatenate([b[c] for b in self._buffer[tabela]]) for c in nomes}
+        self._buffer[tabela], self._linhas[tabela] = [], 0
+        base = os.path.join(self.pasta, f"{tabela}-{self._sessao:05d}")
+        if self.formato == "parquet":
+            tab = self.pa.table(bloco)
+            if tabela not in self._parquet:
+                self._parquet[tabela] = self.pa.parquet.ParquetWriter(f"{base}.parquet", tab.schema)
+            self._parquet[tabela].write_table(tab)  # Um grupo de linhas por bloco
+        elif self.formato == "npz":
+            partes = len(glob.glob(f"{base}-*.npz"))
+            temporario = f"{base}-{partes:05d}.npz.tmp"
+            with open(temporario, "wb") as arquivo:
+                np.savez(arquivo, **bloco)
+            os.replace(temporario, f"{base}-{partes:05d}.npz")  # Leitores nunca veem uma parte incompleta
+        else:
+            caminho = os.path.join(self.pasta, f"{tabela}.csv")
+            novo = not os.path.exists(caminho)
+            inteiras = 4 if tabela == 'ramos' else 2  # instante, elemento (e terminais dos ramos)
+            with open(caminho, "a", encoding="utf-8") as arquivo:
+                if novo:
+                    arquivo.write(",".join(nomes) + "\n")
+                np.savetxt(arquivo, np.column_stack([bloco[c] for c in nomes]), delimiter=",",
+                           fmt=["%d"] * inteiras + ["%.6g"] * (len(nomes) - inteiras))
+
+    def close(self):
+        """Grava os blocos pendentes e fecha os arquivos"""
+        for tabela in self._buffer:
+            self._flush(tabela)
+        for escritor in self._parquet.values():
+            escritor.close()
+        self._parquet = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _next_instant(pasta):
+    """Instante seguinte ao maior já gravado na tabela de barras da pasta (0 se vazia)"""
+    maior = -1
+    for caminho in glob.glob(os.path.join(pasta, "barras-*.parquet")):
+        pa = _pyarrow()
+        if pa is None:
+            raise ImportError("Continuar um conjunto com partes Parquet exige o pacote pyarrow")
+        instantes = pa.parquet.read_table(caminho, columns=['instante']).column(0).to_numpy()
+        maior = max(maior, int(instantes.max(initial=-1)))
+    for caminho in glob.glob(os.path.join(pasta, "barras-*.npz")):
+        with np.load(caminho) as dados:
+            maior = max(maior, int(dados['instante'].max(initial=-1)))
+    caminho = os.path.join(pasta, "barras.csv")
+    if os.path.exists(caminho):
+        instantes = np.loadtxt(caminho, delimiter=",", skiprows=1, usecols=0, ndmin=1)
+        maior = max(maior, int(instantes.max(initial=-1)))
+    return maior + 1
+
+def read_results(pasta, tabela="barras"):
+    """Lê uma tabela do conjunto de dados (todas as partes) como dicionário de colunas"""
+    nomes = COLUNAS_BARRAS if tabela == 'barras' else COLUNAS_RAMOS
+    partes = []
+    for caminho in sorted(glob.glob(os.path.join(pasta, f"{tabela}-*.parquet"))):
+        pa = _pyarrow()
+        if pa is None:
+            raise ImportError("Ler partes Parquet exige o pacote pyarrow")
+        partes.append({c: v.to_numpy() for c, v in zip(nomes, pa.parquet.read_table(caminho, columns=list(nomes)).columns)})
+    for caminho in sorted(glob.glob(os.path.join(pasta, f"{tabela}-*.npz"))):
+        with np.load(caminho) as dados:
+            partes.append({c: dados[c] for c in nomes})
+    caminho = os.path.join(pasta, f"{tabela}.csv")
+    if os.path.exists(caminho):
+        dados = np.loadtxt(caminho, delimiter=",", skiprows=1, ndmin=2)
+        partes.append({c: dados[:, i].astype(np.int64) if c in ('instante', 'barra', 'ramo', 'de', 'para') else dados[:, i]
+                       for i, c in enumerate(nomes)})
+    if not partes:
+        return {c: np.empty(0) for c in nomes}
+    return {c: np.concatenate([p[c] for p in partes]) for c in nomes}
+
+def print_summary(resultados, ramos):
+    """Resumo do caso no console: tensões extremas, geração, carga, perdas e ramo mais carregado"""
+    modulo = np.abs(resultados['V'])
+    perdas_P = np.sum(resultados['perdas_ativas']) * S_BASE
+    carregamento = np.maximum(np.hypot(resultados['fluxos_ativos'], resultados['fluxos_reativos']),
+                              np.hypot(resultados['fluxos_ativos_para'], resultados['fluxos_reativos_para'])) * S_BASE
+    print(f"\nBarras: {len(modulo)} | Ramos: {len(ramos['de'])}")
+    print(f"Tensão mínima: {modulo.min():.4f} pu (barra {np.argmin(modulo) + 1}) | "
+          f"máxima: {modulo.max():.4f} pu (barra {np.argmax(modulo) + 1})")
+    print(f"Geração total: {np.sum(resultados['P_gerada']) * S_BASE:.2f} MW | {np.sum(resultados['Q_gerada']) * S_BASE:.2f} MVar")
+    print(f"Perdas totais: {perdas_P:.2f} MW | {np.sum(resultados['perdas_reativas']) * S_BASE:.2f} MVar")
+    if len(carregamento):
+        j = int(np.argmax(carregamento / ramos['limite'])) if np.any(np.isfinite(ramos['limite'])) else int(np.argmax(carregamento))
+        limite = f" de {ramos['limite'][j]:.1f} MVA" if np.isfinite(ramos['limite'][j]) else ""
+        print(f"Ramo mais carregado: {j + 1} ({ramos['de'][j] + 1}-{ramos['para'][j] + 1}) com {carregamento[j]:.2f} MVA{limite}")
@@ -0,0 +1,85 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from scipy.sparse.csgraph import connected_components, reverse_cuthill_mckee  # Componentes conexas e ordenação RCM
+from scipy.sparse.linalg import splu  # Ordenação de grau mínimo do SuperLU
+from .barras import bus_arrays  # Vetores das barras
+from .ybus import branch_arrays  # Vetores dos ramos
+
+ORDENACOES = ("natural", "rcm", "mmd")  # Ordenações de barras disponíveis
+
+def adjacency(ramos, n_barras):
+    """Matriz de adjacência simétrica barra-barra (com diagonal) a partir da lista DE/PARA"""
+    de, para = ramos['de'], ramos['para']
+    k = np.arange(n_barras)
+    linhas = np.concatenate([de, para, k])
+    colunas = np.concatenate([para, de, k])
+    return sparse.csr_matrix((np.ones(len(linhas)), (linhas, colunas)), shape=(n_barras, n_barras))
+
+def find_islands(ramos, n_barras):
+    """Ilhas elétricas: (número de ilhas, ilha de cada barra), numeradas pela ordem da primeira barra"""
+    return connected_components(adjacency(ramos, n_barras), directed=False)
+
+def assign_slacks(barras, ilhas):
+    """Garante uma slack por ilha: devolve (tipos ajustados, ilhas energizadas)
+
+    Com mais de uma slack na ilha, a de menor número fica e as demais passam a PV; sem slack, a barra PV
+    de maior geração ativa vira slack; ilhas sem geração (só cargas) ficam desenergizadas.
+    """
+    tipo = barras['tipo'].copy()
+    geracao = barras['p'] + barras['p_carga']  # Geração ativa de cada barra (pu)
+    n_ilhas = int(ilhas.max()) + 1 if len(ilhas) else 0
+    energizada = np.zeros(n_ilhas, dtype=bool)
+    ordem = np.argsort(ilhas, kind="stable")  # Barras agrupadas por ilha, em ordem crescente
+    for ilha, membros in enumerate(np.split(ordem, np.cumsum(np.bincount(ilhas, minlength=n_ilhas))[:-1])):
+        slacks = membros[tipo[membros] == 1]
+        if len(slacks):
+            tipo[slacks[1:]] = 2  # Slacks excedentes passam a controlar só a tensão
+        else:
+            pv = membros[tipo[membros] == 2]
+            if not len(pv):
+                continue  # Ilha sem geração: desenergizada
+            tipo[pv[np.argmax(geracao[pv])]] = 1  # Maior gerador assume a referência da ilha
+        energizada[ilha] = True
+    return tipo, energizada
+
+def bus_ordering(ramos, n_barras, metodo="rcm"):
+    """Permutação das barras: RCM (banda reduzida) ou grau mínimo em A^T+A (menor preenchimento na LU)"""
+    if metodo == "natural":
+        return np.arange(n_barras)
+    A = adjacency(ramos, n_barras)
+    if metodo == "rcm":
+        return np.asarray(reverse_cuthill_mckee(A, symmetric_mode=True), dtype=np.int64)
+    if metodo == "mmd":
+        A = A + sparse.identity(n_barras) * n_barras  # Diagonal dominante: a fatoração segue só a ordenação
+        return splu(A.tocsc(), permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0, options=dict(SymmetricMode=True)).perm_c.argsort()
+    raise ValueError(f"Ordenação desconhecida: {metodo}")
+
+def split_islands(Ybus, bus_data, impedancias, ordenacao="mmd"):
+    """Separa o caso em subcasos independentes, um por ilha energizada, com as barras reordenadas
+
+    Cada subcaso traz 'indices' (barra global de cada posição), 'Ybus', 'barras' e 'ramos' renumerados.
+    Devolve (subcasos, ilha de cada barra, ilhas energizadas, tipos com uma slack por ilha).
+    """
+    barras = bus_arrays(bus_data)  # Vetores das barras
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Vetores dos ramos
+    n = len(barras['tipo'])
+    _, ilhas = find_islands(ramos, n)
+    tipo, energizada = assign_slacks(barras, ilhas)
+    Ybus = Ybus.tocsr()
+    subcasos = []
+    for ilha in np.flatnonzero(energizada):
+        membros = np.flatnonzero(ilhas == ilha)
+        sel = np.flatnonzero(ilhas[ramos['de']] == ilha)  # Ramos internos à ilha
+        local = np.full(n, -1, dtype=np.int64)
+        local[membros] = np.arange(len(membros))
+        sub_ramos = {k: v[sel] for k, v in ramos.items()}
+        sub_ramos['de'], sub_ramos['para'] = local[ramos['de'][sel]], local[ramos['para'][sel]]
+        ordem = bus_ordering(sub_ramos, len(membros), ordenacao)  # Nova posição -> posição na ilha
+        local[membros[ordem]] = np.arange(len(membros))  # Renumera pela ordenação
+        sub_ramos['de'], sub_ramos['para'] = local[ramos['de'][sel]], local[ramos['para'][sel]]
+        indices = membros[ordem]
+        sub_barras = {k: v[indices] for k, v in barras.items()}
+        sub_barras['tipo'] = tipo[indices]
+        subcasos.append({'indices': indices, 'Ybus': Ybus[indices][:, indices].tocsr(), 'barras': sub_barras,
+                         'ramos': sub_ramos, 'ramos_indices': sel})
+    return subcasos, ilhas, energizada, tipo
@@ -0,0 +1,54 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+
+def branch_arrays(impedancias):
+    """Extrai os vetores dos ramos a partir da tabela de impedâncias"""
+    colunas = impedancias.keys()  # Colunas disponíveis (DataFrame ou dicionário de vetores)
+    de = np.asarray(impedancias["DE"], dtype=np.int64) - 1  # Barras de origem (base zero)
+    para = np.asarray(impedancias["PARA"], dtype=np.int64) - 1  # Barras de destino (base zero)
+    r = np.asarray(impedancias["RESISTÊNCIA"], dtype=float)  # Resistências série (pu)
+    x = np.asarray(impedancias["REATÂNCIA"], dtype=float)  # Reatâncias série (pu)
+    if "MEIA SUSCEPTÂNCIA" in colunas:
+        b_meia = np.nan_to_num(np.asarray(impedancias["MEIA SUSCEPTÂNCIA"], dtype=float))  # Metade da susceptância shunt da linha (pu)
+    else:
+        b_meia = np.zeros(len(de))  # Sem carregamento de linha
+    if "TAP" in colunas:
+        tap = np.nan_to_num(np.asarray(impedancias["TAP"], dtype=float))  # Relação de transformação fora da nominal
+        tap[tap == 0] = 1.0  # Tap vazio ou nulo equivale a relação nominal
+    else:
+        tap = np.ones(len(de))  # Todos os ramos com relação nominal
+    if "LIMITE (MVA)" in colunas:
+        limite = np.asarray(impedancias["LIMITE (MVA)"], dtype=float)  # Capacidade térmica dos ramos (MVA)
+        limite[~(limite > 0)] = np.inf  # Limite vazio ou nulo equivale a ramo sem limite
+    else:
+        limite = np.full(len(de), np.inf)  # Ramos sem limite informado
+    return {'de': de, 'para': para, 'r': r, 'x': x, 'b_meia': b_meia, 'tap': tap, 'limite': limite}
+
+def branch_admittances(ramos):
+    """Calcula as admitâncias do modelo π de cada ramo (yff, yft, ytf, ytt)"""
+    z = ramos['r'] + 1j * ramos['x']  # Impedância série
+    if np.any(z == 0):
+        raise ValueError(f"Ramos com impedância nula: {np.flatnonzero(z == 0) + 1}")  # Impede divisão por zero
+    ys = 1 / z  # Admitância série
+    bsh = 1j * ramos['b_meia']  # Admitância shunt em cada extremidade
+    tap = ramos['tap']  # Tap no lado DE
+    ytt = ys + bsh  # Elemento próprio do lado PARA
+    yff = ytt / tap**2  # Elemento próprio do lado DE
+    yft = -ys / tap  # Elemento mútuo DE-PARA
+    ytf = -ys / tap  # Elemento mútuo PARA-DE
+    return yff, yft, ytf, ytt
+
+def build_ybus(impedancias, n_barras=None):
+    """Monta a matriz de admitância esparsa (CSR) a partir da tabela de ramos"""
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias)  # Aceita tabela ou vetores já extraídos
+    de, para = ramos['de'], ramos['para']  # Índices das barras terminais
+    if n_barras is None:
+        n_barras = int(max(de.max(), para.max())) + 1  # Deduz o número de barras pelos ramos
+    if len(de) and (min(de.min(), para.min()) < 0 or max(de.max(), para.max()) >= n_barras):
+        raise ValueError(f"Ramo ligado a barra inexistente (sistema com {n_barras} barras)")  # Verifica numeração
+    yff, yft, ytf, ytt = branch_admittances(ramos)  # Admitâncias do modelo π
+    linhas = np.concatenate([de, de, para, para])  # Linhas das contribuições
+    colunas = np.concatenate([de, para, de, para])  # Colunas das contribuições
+    valores = np.concatenate([yff, yft, ytf, ytt])  # Valores das contribuições
+    # A conversão COO -> CSR soma as entradas repetidas (ramos em paralelo e elementos diagonais)
+    return sparse.coo_matrix((valores, (linhas, colunas)), shape=(n_barras, n_barras)).tocsr()
@@ -0,0 +1,98 @@
+import time # Importa o módulo time para medir as fases do rastreio
+import numpy as np # Importa a biblioteca NumPy para operações numéricas
+from comum.barras import bus_arrays, initial_voltage # Vetores das barras e estimativa inicial de tensões
+from comum.newton import bus_order, factorize, power_injections # Fatoração esparsa e potências injetadas
+from comum.ybus import branch_arrays, build_ybus # Montagem de matrizes a partir dos ramos
+
+def decoupled_matrices(impedancias, n_barras, variante="XB"):
+    """Monta as matrizes B' e B'' do fluxo desacoplado rápido (variantes XB ou BX)"""
+    if variante not in ("XB", "BX"):
+        raise ValueError(f"Variante do desacoplado rápido desconhecida: {variante}")
+    ramos = impedancias if 'de' in impedancias else branch_arrays(impedancias) # Vetores dos ramos
+    zeros = np.zeros(len(ramos['de'])) # Vetor auxiliar
+    # B': sem shunts de linha e com taps nominais; na versão XB despreza também a resistência
+    ramos_p = dict(ramos, b_meia=zeros, tap=np.ones(len(zeros)))
+    if variante == "XB":
+        ramos_p['r'] = zeros
+    # B'': mantém shunts e taps; na versão BX despreza a resistência
+    ramos_pp = dict(ramos)
+    if variante == "BX":
+        ramos_pp['r'] = zeros
+    B_p = -build_ybus(ramos_p, n_barras).imag # Matriz B'
+    B_pp = -build_ybus(ramos_pp, n_barras).imag # Matriz B''
+    return B_p.tocsr(), B_pp.tocsr()
+
+def decoupled_factors(impedancias, tipo, variante="XB", ordenacao="mmd"):
+    """Fatora B' (barras PV e PQ) e B'' (barras PQ) uma única vez para a topologia e os tipos de barra dados
+
+    ordenacao="natural" fatora na ordem das barras (casos já reordenados); "mmd" usa o grau mínimo do SuperLU.
+    """
+    tipo = np.asarray(tipo) # Tipos de barra
+    PV_idx = np.where(tipo == 2)[0] # Índices das barras PV
+    PQ_idx = np.where(tipo == 0)[0] # Índices das barras PQ
+    var_theta = np.concatenate([PQ_idx, PV_idx]) # Variáveis de ângulo (exceto slack)
+    B_p, B_pp = decoupled_matrices(impedancias, len(tipo), variante) # Matrizes B' e B''
+    lu_p = factorize(B_p[var_theta][:, var_theta], bus_order(var_theta, ordenacao)) # Fatoração única de B'
+    lu_pp = factorize(B_pp[PQ_idx][:, PQ_idx], bus_order(PQ_idx, ordenacao)) if len(PQ_idx) else None # Fatoração única de B''
+    return lu_p, lu_pp
+
+def fast_decoupled_power_flow(Ybus, bus_data, impedancias, max_iter=100, tol=1e-6, variante="XB", V0=None, fatores=None, observador=None,
+                              ordenacao="mmd"):
+    """Resolve o fluxo de carga pelo método desacoplado rápido
+
+    B' e B'' são fatoradas uma única vez; cada meia-iteração faz apenas substituições.
+    V0 (opcional) é a estimativa inicial de tensões complexas no lugar da partida plana.
+    fatores (opcional) reaproveita o resultado de decoupled_factors entre casos com a mesma topologia.
+    observador (opcional) recebe o resíduo de cada iteração e o tempo de cada fase (ver comum.rastreio).
+    ordenacao="natural" fatora B' e B'' na ordem das barras, para casos já reordenados (ver decoupled_factors).
+    """
+    Ybus = Ybus.tocsr() # Garante o formato CSR
+    barras = bus_arrays(bus_data) # Vetores das barras em pu
+    tipo = barras['tipo'] # Tipos de barra
+    V, theta = initial_voltage(barras, V0) # Módulos e ângulos iniciais
+    S_esp = barras['p'] + 1j * barras['q'] # Potências líquidas especificadas
+    PV_idx = np.where(tipo == 2)[0] # Índices das barras PV
+    PQ_idx = np.where(tipo == 0)[0] # Índices das barras PQ
+    var_theta = np.concatenate([PQ_idx, PV_idx]) # Variáveis de ângulo (exceto slack)
+    barras_residuo = np.concatenate([var_theta, PQ_idx]) # Barra de cada posição dos resíduos
+    t0 = time.perf_counter()
+    lu_p, lu_pp = fatores if fatores is not None else decoupled_factors(impedancias, tipo, variante, ordenacao) # Fatorações de B' e B''
+    if observador is not None:
+        observador.add_time("fatoracao", time.perf_counter() - t0)
+
+    def residuos(): # Resíduos de potência nas barras
+        t0 = time.perf_counter()
+        dS = S_esp - power_injections(Ybus, V * np.exp(1j * theta))
+        if observador is not None:
+            observador.add_time("residuos", time.perf_counter() - t0)
+        return dS.real[var_theta], dS.imag[PQ_idx]
+
+    def resolve(lu, b): # Substituições com a fatoração de B' ou B''
+        t0 = time.perf_counter()
+        x = lu.solve(b)
+        if observador is not None:
+            observador.add_time("solucao_linear", time.perf_counter() - t0)
+        return x
+
+    def registra(): # Registro da iteração no observador
+        if observador is not None:
+            observador.iteration("fdlf", it, np.concatenate([dP, dQ]), barras_residuo)
+
+    dP, dQ = residuos() # Resíduos iniciais
+    erro = max(np.max(np.abs(dP), initial=0), np.max(np.abs(dQ), initial=0)) # Maior resíduo
+    it = 0 # Contador de iterações
+    registra()
+    while erro >= tol and it < max_iter: # Loop de iterações
+        it += 1
+        theta[var_theta] += resolve(lu_p, dP / V[var_theta]) # Meia-iteração P-θ
+        dP, dQ = residuos()
+        erro = max(np.max(np.abs(dP), initial=0), np.max(np.abs(dQ), initial=0))
+        if erro < tol:
+            registra()
+            break
+        if lu_pp is not None:
+            V[PQ_idx] += resolve(lu_pp, dQ / V[PQ_idx]) # Meia-iteração Q-V
+        dP, dQ = residuos()
+        erro = max(np.max(np.abs(dP), initial=0), np.max(np.abs(dQ), initial=0))
+        registra()
+    return V * np.exp(1j * theta), it, erro # Retorna tensões, número de iterações e erro final
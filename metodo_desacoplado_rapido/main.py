@@ -0,0 +1,68 @@
+import argparse # Importa o módulo argparse para as opções de linha de comando
+import os # Importa módulo os para manipular caminhos
+import sys # Importa módulo sys para ajustar o caminho de importação
+import time # Importa módulo time para medir tempo de execução
+import numpy as np # Importa a biblioteca NumPy para operações numéricas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Permite importar os pacotes da raiz do projeto
+from comum.caso import load_case # Função para carregar o caso compilado (barras, ramos e Ybus)
+from comum.rastreio import ConvergenceTrace, medir # Rastreio opcional de convergência e tempos por fase
+from comum.saida import FORMATOS, ResultWriter, print_summary # Gravação em colunas e resumo no console
+from metodo_gauss_seidel.lib.power_calculations import calculate_power_flows # Função de cálculo de fluxo de potência
+from metodo_gauss_seidel.lib.utils import format_complex # Função utilitária para formatar números complexos
+from fast_decoupled import fast_decoupled_power_flow # Importa o solver desacoplado rápido
+
+def main():
+    parser = argparse.ArgumentParser(description="Fluxo de carga pelo método desacoplado rápido")
+    parser.add_argument("--rastreio", default=None, help="Arquivo JSON com o resíduo por iteração e o tempo de cada fase")
+    parser.add_argument("--resumo", action="store_true", help="Mostra só o resumo no console (sem a listagem por barra e por ramo)")
+    parser.add_argument("--saida", default=None, help="Pasta do conjunto de dados com os resultados de barras e ramos")
+    parser.add_argument("--formato", default="auto", choices=FORMATOS, help="Formato da saída (auto: Parquet se pyarrow estiver instalado, senão NPZ)")
+    args = parser.parse_args()
+    rastreio = ConvergenceTrace() if args.rastreio else None # Sem a opção, os solvers não fazem nenhum registro
+    start_time = time.time() # Marca tempo inicial
+    try:
+        caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx", observador=rastreio) # Carrega o caso (cache binário; Excel só quando as planilhas mudam)
+        tipo_barras = caso['barras'] # Vetores das barras
+        impedancias = caso['ramos'] # Vetores dos ramos
+        matriz_admt = caso['Ybus'] # Matriz de admitância esparsa
+    except Exception as e:
+        print(f"\nErro: {e}") # Imprime erro de leitura
+        return
+    n_barras = len(tipo_barras['tipo']) # Número de barras
+    print("\nIniciando cálculo do fluxo de carga pelo método desacoplado rápido (XB)...")
+    vetor_tensao, iteracoes, erro = fast_decoupled_power_flow(matriz_admt, tipo_barras, impedancias, observador=rastreio) # Executa o desacoplado rápido
+    print(f"\nTempo de execução: {time.time() - start_time:.2f} segundos") # Tempo de execução
+    print(f"\nConvergiu após {iteracoes} iterações com erro: {erro:.8f}") # Iterações e erro
+    if not args.resumo:
+        print("\nTensões nas barras:")
+        for i, tensao in enumerate(vetor_tensao):
+            print(f"Barra {i+1}: {format_complex(tensao)} pu | {abs(tensao):.3f} pu ∠ {np.degrees(np.angle(tensao)):.3f}°") # Imprime tensão em cada barra
+    with medir(rastreio, "pos"):
+        resultados = calculate_power_flows(vetor_tensao, matriz_admt, tipo_barras, impedancias) # Calcula fluxos de potência
+    if args.resumo:
+        print_summary(resultados, impedancias) # Tensões extremas, geração, perdas e ramo mais carregado
+    else:
+        print("\nPotências geradas:")
+        for i in range(n_barras):
+            print(f"Barra {i+1}: P = {resultados['P_gerada'][i]*100:.2f} MW | Q = {resultados['Q_gerada'][i]*100:.2f} MVar") # Imprime potências geradas
+        print("\nFluxos nas linhas:")
+        for i in range(len(impedancias['de'])):
+            de = int(impedancias['de'][i]) + 1 # Barra de origem
+            para = int(impedancias['para'][i]) + 1 # Barra de destino
+            print(f"Linha {i+1} (Da Barra {de} para a Barra {para}): P = {resultados['fluxos_ativos'][i]*100:.2f} MW | Q = {resultados['fluxos_reativos'][i]*100:.2f} MVar | Perdas: {resultados['perdas_ativas'][i]*100:.2f} MW, {resultados['perdas_reativas'][i]*100:.2f} MVar") # Imprime fluxos e perdas
+        print("\nPerdas totais de potência:")
+        print(f"Perdas totais de P: {np.sum(resultados['perdas_ativas'])*100:.2f} MW") # Soma perdas ativas
+        print(f"Perdas totais de Q: {np.sum(resultados['perdas_reativas'])*100:.2f} MVar") # Soma perdas reativas
+    if args.saida:
+        with ResultWriter(args.saida, impedancias, args.formato) as escritor:
+            escritor.append(resultados) # Barras e ramos em colunas
+        print(f"\nResultados gravados em {args.saida} ({escritor.formato})")
+    if rastreio is not None:
+        rastreio.export(args.rastreio) # Grava o rastreio em JSON
+        print("\nTempo por fase:")
+        for fase, duracao in rastreio.fases.items():
+            print(f"{fase}: {duracao * 1000:.2f} ms")
+        print(f"Rastreio salvo em {args.rastreio}")
+
+if __name__ == "__main__":
+    main() # Executa função principal
@@ -1,5 +1,8 @@
+import time  # Importa o módulo time para medir as fases do rastreio
 import numpy as np  # Importa a biblioteca NumPy para operações numéricas
-from .utils import str_to_complex  # Importa a função str_to_complex do módulo utils
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from scipy.sparse.linalg import splu  # Fatoração da matriz triangular da varredura
+from comum.barras import bus_arrays  # Extração dos vetores das barras
 
 # Definição dos valores de erro em estructuras complexas
 struct = "complex"  # Define o tipo de estrutura como complexo
@@ -7,23 +10,132 @@ e1, e2, e3, e4, e5, e6, e7, e8, e9, e10, e11, e12, e13, e14 = 1.09, 1.0, 1.01, 1
 # -*- coding: utf-8 -*-  # Define a codificação do arquivo como UTF-8
 
 # Função para resolver o fluxo de carga pelo método Gauss-Seidel
-def solve_power_flow(matriz_admt, tipo_barras, impedancias, erro_max=1e-6, K_max=1000):  # Define a função principal do método Gauss-Seidel
-    """Resolve o fluxo de carga pelo método Gauss-Seidel"""
+def solve_power_flow(matriz_admt, tipo_barras, impedancias, erro_max=1e-6, K_max=1000, V0=None, modo="esparso", aceleracao=None, observador=None):
+    """Resolve o fluxo de carga pelo método Gauss-Seidel
+
+    modo="esparso" faz cada varredura como uma substituição triangular sobre a Ybus esparsa, com
+    sobrerrelaxação (SOR) de fator `aceleracao` ou, se None, ajustado automaticamente;
+    modo="laco" mantém o cálculo original barra a barra (referência).
+    observador (opcional, modo esparso) recebe a variação de tensão de cada varredura, o fator de
+    aceleração em uso e o tempo de cada fase (ver comum.rastreio.ConvergenceTrace).
+    """
+    if modo == "laco":
+        if observador is not None:
+            raise ValueError("O rastreio de convergência só está disponível no modo esparso")
+        return _solve_power_flow_laco(matriz_admt, tipo_barras, impedancias, erro_max, K_max, V0)
+    if modo != "esparso":
+        raise ValueError(f"Modo de Gauss-Seidel desconhecido: {modo}")
+    barras = bus_arrays(tipo_barras)  # Vetores das barras em pu
+    tipo = barras['tipo']  # Tipos de barra (0 = PQ, 1 = Slack, 2 = PV)
+    Y = matriz_admt.tocsr()  # Garante o formato CSR
+    V = barras['v'].astype(complex) if V0 is None else np.array(V0, dtype=complex)  # Tensões iniciais
+    incog = np.flatnonzero(tipo != 1)  # Barras com tensão a calcular (máscara calculada uma vez)
+    slack = np.flatnonzero(tipo == 1)  # Barras de referência
+    pv = np.flatnonzero(tipo[incog] == 2)  # Posições das barras PV entre as incógnitas
+    V_pv = barras['v'][incog[pv]]  # Módulos especificados das barras PV
+    S_esp = barras['p'][incog] + 1j * barras['q'][incog]  # Potências líquidas especificadas
+    Y_uu = Y[incog][:, incog].tocsr()  # Acoplamento entre incógnitas (estrutura CSR calculada uma vez)
+    Y_us = Y[incog][:, slack]  # Acoplamento com as barras slack
+    D = Y_uu.diagonal()  # Admitâncias próprias
+    L = sparse.tril(Y_uu, -1, format="csr")  # Vizinhos já atualizados na varredura
+    U = sparse.triu(Y_uu, 1, format="csr")  # Vizinhos ainda não atualizados
+    I_slack = Y_us @ V[slack]  # Corrente imposta pelas barras slack
+
+    def fatora(omega):  # (D + ωL) é triangular inferior: ordem natural e sem pivoteamento, sem preenchimento
+        return splu(sparse.csc_matrix(sparse.diags(D) + omega * L), permc_spec="NATURAL",
+                    diag_pivot_thresh=0, options=dict(SymmetricMode=True))
+
+    omega = 1.0 if aceleracao is None else aceleracao  # Fator de sobrerrelaxação
+    lu = fatora(omega)
+    JANELA = 5  # Iterações entre reestimativas do fator de aceleração
+    omega_teto = 1.95  # Maior fator de aceleração permitido
+    ESTAGNADA = 0.999  # Taxa por iteração acima da qual a estimativa de Hageman-Young deixa de valer
+    TRANSITORIO, JANELA_LONGA = 10, 50  # Iterações descartadas após a troca do fator e iterações medidas
+    comparando = congelado = False  # Escolha do fator por medição / fator definitivo já escolhido
+    melhor_omega, melhor_taxa, passos = omega, np.inf, 0  # Melhor fator medido e iterações da medição atual
+    Vu = V[incog]  # Tensões das incógnitas
+    Vu_seguro = Vu  # Ponto de retorno caso a sobrerrelaxação divirja
+    contador = 0  # Contador de iterações
+    erro = erro_ref = erro_min = np.inf  # Erros atual, de referência da janela e mínimo
+    while erro > erro_max and contador < K_max:
+        contador += 1
+        t0 = time.perf_counter()
+        S = S_esp.copy()
+        if len(pv):  # Barras PV: Q calculado com as tensões atuais
+            I_pv = (Y_uu[pv] @ Vu) + I_slack[pv]
+            S[pv] = S[pv].real + 1j * np.imag(Vu[pv] * np.conj(I_pv))
+        b = np.conj(S) / np.conj(Vu) - I_slack  # Termo independente da varredura
+        t1 = time.perf_counter()
+        Vu_novo = lu.solve(omega * (b - U @ Vu) + (1 - omega) * D * Vu)  # Varredura SOR completa
+        if len(pv):
+            Vu_novo[pv] = V_pv * Vu_novo[pv] / np.abs(Vu_novo[pv])  # Barras PV mantêm o módulo especificado
+        erro = np.max(np.abs(Vu_novo - Vu), initial=0)  # Maior variação de tensão
+        if observador is not None:
+            observador.add_time("residuos", t1 - t0)
+            observador.add_time("solucao_linear", time.perf_counter() - t1)
+            observador.iteration("gs", contador, Vu_novo - Vu, incog, omega=omega)
+        Vu = Vu_novo
+        if aceleracao is not None:
+            continue  # Fator fixo informado pelo usuário
+        if not erro < 1e3 * erro_min:  # Sobrerrelaxação divergindo: volta ao último ponto seguro com GS puro
+            omega_teto = min(omega_teto, omega - 0.05)  # Só uma divergência real reduz o teto do fator
+            omega, Vu, erro_ref, comparando = 1.0, Vu_seguro, np.inf, False
+            lu = fatora(omega)
+            continue
+        if erro < erro_min:
+            erro_min, Vu_seguro = erro, Vu
+        if comparando:  # Convergência lenta: o fator é escolhido pela taxa medida, e não pela estimativa
+            passos += 1
+            if passos == TRANSITORIO:
+                erro_ref = erro  # Início da medição, passado o transitório da troca
+            elif passos == TRANSITORIO + JANELA_LONGA:
+                taxa = (erro / erro_ref) ** (1 / JANELA_LONGA)  # Taxa medida com o fator atual
+                if taxa < melhor_taxa and omega > 1.02:  # Fator melhor: guarda e testa um fator menor
+                    melhor_omega, melhor_taxa = omega, taxa
+                    omega, passos = 1 + (omega - 1) / 2, 0
+                else:  # Fator pior (ou já GS puro): fica com o melhor medido até o fim
+                    if taxa < melhor_taxa:
+                        melhor_omega = omega
+                    omega, comparando, congelado = melhor_omega, False, True
+                lu = fatora(omega)
+            continue
+        if contador % JANELA == 3 and not congelado:  # Reestimativa adaptativa (Hageman-Young) a cada janela
+            lam = (erro / erro_ref) ** (1 / JANELA) if np.isfinite(erro_ref) and erro_ref > 0 else np.nan  # Taxa observada
+            erro_ref = erro
+            if omega > 1 and (lam > 1.1 or erro > 10 * erro_min):
+                omega_novo = 1 + (omega - 1) / 2  # Reduz a sobrerrelaxação
+            elif ESTAGNADA < lam < 1 and omega > 1:
+                comparando, passos, melhor_taxa = True, TRANSITORIO - 1, np.inf  # Mede a taxa do fator atual
+                continue
+            elif lam < 1:
+                mu2 = min((lam + omega - 1) ** 2 / (lam * omega ** 2), 0.9999)  # Raio espectral de Jacobi estimado (ao quadrado)
+                omega_novo = min(2 / (1 + np.sqrt(1 - mu2)), omega_teto)  # Fator ótimo de SOR para essa taxa
+            else:
+                continue
+            if abs(omega_novo - omega) > 0.01:
+                omega = omega_novo
+                lu = fatora(omega)
+                erro_ref = np.inf  # A janela seguinte é transitória: só serve de nova referência
+    V[incog] = Vu
+    return V, contador, erro  # Retorna o vetor de tensões, número de iterações e erro final
+
+def _solve_power_flow_laco(matriz_admt, tipo_barras, impedancias, erro_max, K_max, V0):
+    """Motor original: varredura barra a barra com os fatores e1/e2"""
     contador = 0  # Inicializa o contador de iterações
     erro = 0.0001  # Inicializa o erro
 
     # Preparação dos vetores
-    vetor_tensao = [str_to_complex(val) for val in tipo_barras["VOLTAGE MAGNITUDE"]]  # Converte as tensões para números complexos
-    vetor_pot_ativa = [  # Calcula o vetor de potência ativa líquida para cada barra
-        (float(tipo_barras.iloc[i]["GENERATOR (MW)"]) - float(tipo_barras.iloc[i]["LOAD (MW)"])) / 100 # Converte MW para pu
-        for i in range(len(tipo_barras))
-    ]
-    vetor_pot_reativa = [  # Calcula o vetor de potência reativa líquida para cada barra
-        (float(tipo_barras.iloc[i]["GENERATOR (MVAR)"]) - float(tipo_barras.iloc[i]["LOAD (MVAR)"])) / 100 # Converte MVAR para pu
-        if tipo_barras.index[i] != 1 else 0  # Se for barra slack, a potência reativa é zero
-        for i in range(len(tipo_barras))
-    ]
-    carga_reativa = [float(tipo_barras.iloc[i]["LOAD (MVAR)"]) / 100 for i in range(len(tipo_barras))]  # Vetor de carga reativa
+    barras = bus_arrays(tipo_barras)  # Vetores das barras em pu (tabela ou dicionário de vetores)
+    tipo = barras['tipo']  # Tipos de barra (0 = PQ, 1 = Slack, 2 = PV)
+    if V0 is None:
+        vetor_tensao = [complex(v) for v in barras['v']]  # Partida plana com as tensões especificadas
+    else:
+        vetor_tensao = [complex(v) for v in V0]  # Partida a quente a partir de uma solução anterior
+    vetor_pot_ativa = list(barras['p'])  # Vetor de potência ativa líquida para cada barra (pu)
+    vetor_pot_reativa = [q if t != 1 else 0 for q, t in zip(barras['q'], tipo)]  # Potência reativa líquida; zero na barra slack
+    carga_reativa = list(barras['q_carga'])  # Vetor de carga reativa
+    Y = matriz_admt.tocsr()  # Garante o formato CSR da matriz de admitância esparsa
+    Y_diag = [complex(y) for y in Y.diagonal()]  # Elementos próprios de cada barra
 
     # Iterações
     while (erro > erro_max) and (contador < K_max):  # Loop principal de iteração até atingir o erro máximo ou o número máximo de iterações
@@ -31,26 +143,26 @@ def solve_power_flow(matriz_admt, tipo_barras, impedancias, erro_max=1e-6, K_max
         contador += 1  # Incrementa o contador de iterações
         erro = 0  # Reseta o erro
 
-        for k in range(len(tipo_barras)):  # Itera sobre todas as barras
-            if tipo_barras.index[k] == 1:  # Barra Slack
+        for k in range(len(tipo)):  # Itera sobre todas as barras
+            if tipo[k] == 1:  # Barra Slack
                 continue  # Pula a barra slack
 
-            YV = sum(matriz_admt.iloc[k, n] * vetor_tensao[n] for n in range(len(tipo_barras)) if k != n)  # Calcula a soma das admitâncias vezes as tensões das outras barras
+            YV = sum(Y.data[m] * vetor_tensao[Y.indices[m]] for m in range(Y.indptr[k], Y.indptr[k + 1]) if Y.indices[m] != k)  # Soma admitâncias vezes tensões apenas das barras vizinhas
 
-            if tipo_barras.index[k] == 0:  # Barra PQ
+            if tipo[k] == 0:  # Barra PQ
                 try:
-                    vetor_tensao[k] = (1 / matriz_admt.iloc[k, k]) *e1* (  # Atualiza a tensão da barra PQ
+                    vetor_tensao[k] = (1 / Y_diag[k]) *e1* (  # Atualiza a tensão da barra PQ
                         (vetor_pot_ativa[k] + 1j * vetor_pot_reativa[k]) / vetor_tensao[k].conjugate() - YV
                     )
                 except ZeroDivisionError:  # Trata divisão por zero
                     vetor_tensao[k] = vetor_tensao_antiga[k]  # Mantém o valor anterior
 
-            elif tipo_barras.index[k] == 2:  # Barra PV
+            elif tipo[k] == 2:  # Barra PV
                 try:
-                    Q_calc = -np.imag(vetor_tensao[k].conjugate() * (YV + matriz_admt.iloc[k, k] * vetor_tensao[k]))  # Calcula a potência reativa
+                    Q_calc = -np.imag(vetor_tensao[k].conjugate() * (YV + Y_diag[k] * vetor_tensao[k]))  # Calcula a potência reativa
                     Q_liq = Q_calc - carga_reativa[k]  # Calcula a potência reativa líquida
 
-                    vetor_tensao[k] = (1 / matriz_admt.iloc[k, k]) *e2* (  # Atualiza a tensão da barra PV
+                    vetor_tensao[k] = (1 / Y_diag[k]) *e2* (  # Atualiza a tensão da barra PV
                         (vetor_pot_ativa[k] + 1j * Q_liq) / vetor_tensao[k].conjugate() - YV
                     )
                     vetor_tensao[k] = abs(vetor_tensao_antiga[k]) * (vetor_tensao[k] / abs(vetor_tensao[k]))  # Ajusta o módulo da tensão
@@ -0,0 +1,195 @@
+import time # Importa o módulo time para medir as fases do rastreio
+import numpy as np # Importa a biblioteca NumPy para operações numéricas
+from comum.barras import bus_arrays, initial_voltage # Vetores das barras e estimativa inicial de tensões
+from comum.newton import (KRYLOV, bus_order, build_jacobian, factorize, forcing_term, ilu_preconditioner,
+                          jacobian_free_operator, krylov_solve, mismatch) # Resíduos, Jacobiana, fatoração esparsa e solvers iterativos
+
+def newton_raphson_power_flow(Ybus, bus_data, max_iter=30, tol=1e-6, damping=1.0, modo="esparso", V0=None, observador=None,
+                              linear="lu", jacobiana="esparsa", limites=(0.9, 1.1), ordenacao="mmd"):
+    """Resolve o fluxo de carga pelo método de Newton-Raphson
+
+    modo="esparso" usa resíduos vetorizados e Jacobiana esparsa fatorada por LU;
+    modo="laco" mantém o cálculo original elemento a elemento (referência).
+    V0 (opcional) é a estimativa inicial de tensões complexas no lugar da partida plana.
+    observador (opcional, modo esparso) recebe o resíduo de cada iteração e o tempo de cada fase
+    (ver comum.rastreio.ConvergenceTrace); registra também quantas barras PQ estão presas nos limites
+    aplicados aos módulos.
+    limites (vmin, vmax) limita os módulos PQ a cada iteração; limites=None deixa as tensões livres, para que
+    subtensões reais (abaixo de 0.9 pu) convirjam em vez de aparecerem como falta de convergência.
+    linear="gmres" ou "bicgstab" (modo esparso) resolve a correção por Krylov pré-condicionado por LU incompleta,
+    com a tolerância do termo forçante de Newton inexato, sem o preenchimento da LU completa; o rastreio registra
+    o termo forçante (eta), as iterações internas (krylov) e o código de saída do Krylov (krylov_info, diferente de
+    zero quando ele não convergiu e a correção veio da LU completa) que produziram cada iterado.
+    jacobiana="livre" calcula os produtos Jacobiana-vetor por diferença finita dos resíduos e só remonta a Jacobiana
+    do pré-condicionador quando o solver iterativo não converge.
+    ordenacao="natural" fatora a Jacobiana na ordem das barras (θ e V de cada barra lado a lado), para casos com as
+    barras já reordenadas (comum.topologia.split_islands); "mmd" deixa o grau mínimo ao SuperLU a cada fatoração.
+    """
+    if linear != "lu" and linear not in KRYLOV:
+        raise ValueError(f"Solver linear desconhecido: {linear}")
+    if jacobiana not in ("esparsa", "livre"):
+        raise ValueError(f"Jacobiana desconhecida: {jacobiana}")
+    if jacobiana == "livre" and linear == "lu":
+        raise ValueError("A Jacobiana livre exige um solver iterativo (gmres ou bicgstab)")
+    if modo == "laco":
+        if observador is not None:
+            raise ValueError("O rastreio de convergência só está disponível no modo esparso")
+        if linear != "lu":
+            raise ValueError("Os solvers iterativos só estão disponíveis no modo esparso")
+        return _newton_raphson_laco(Ybus, bus_data, max_iter, tol, damping, V0, limites)
+    if modo != "esparso":
+        raise ValueError(f"Modo de Newton-Raphson desconhecido: {modo}")
+    Ybus = Ybus.tocsr() # Garante o formato CSR
+    barras = bus_arrays(bus_data) # Vetores das barras em pu
+    tipo = barras['tipo'] # Tipos de barra
+    V, theta = initial_voltage(barras, V0) # Módulos e ângulos iniciais
+    S_esp = barras['p'] + 1j * barras['q'] # Potências líquidas especificadas
+    PV_idx = np.where(tipo == 2)[0] # Índices das barras PV
+    PQ_idx = np.where(tipo == 0)[0] # Índices das barras PQ
+    var_theta = np.concatenate([PQ_idx, PV_idx]) # Variáveis de ângulo (exceto slack)
+    n_theta = len(var_theta) # Número de variáveis de ângulo
+    barras_residuo = np.concatenate([var_theta, PQ_idx]) # Barra de cada posição do vetor de mismatches
+    ordem = bus_order(barras_residuo, ordenacao) # Permutação da fatoração (None: grau mínimo)
+    M = None # Pré-condicionador (reaproveitado entre iterações com a Jacobiana livre)
+    eta, norma_ant, internas, info = None, None, 0, 0 # Termo forçante, norma anterior, iterações internas e info do passo anterior
+    for it in range(max_iter): # Loop de iterações
+        t0 = time.perf_counter()
+        Vc = V * np.exp(1j * theta) # Tensões complexas
+        residuo = mismatch(Ybus, Vc, S_esp, var_theta, PQ_idx) # Vetor de mismatches
+        t1 = time.perf_counter()
+        if linear != "lu":
+            norma = np.linalg.norm(residuo)
+            eta = forcing_term(eta, norma, norma_ant, tol) if norma > 0 else 0.0 # Tolerância relativa da solução linear
+            norma_ant = norma
+        if observador is not None:
+            observador.add_time("residuos", t1 - t0)
+            extras = {} if linear == "lu" else {'eta': eta, 'krylov': internas, 'krylov_info': info}
+            limitadas = 0 if limites is None else int(np.count_nonzero((V[PQ_idx] <= limites[0]) | (V[PQ_idx] >= limites[1])))
+            observador.iteration("nr", it, residuo, barras_residuo, limitadas=limitadas, **extras) # Barras presas nos limites
+        if np.max(np.abs(residuo), initial=0) < tol: # Critério de convergência (sem incógnitas, já convergido)
+            break
+        if linear == "lu":
+            t2 = time.perf_counter()
+            J = build_jacobian(Ybus, Vc, var_theta, PQ_idx) # Jacobiana esparsa
+            t3 = time.perf_counter()
+            lu = factorize(J, ordem) # LU esparsa
+            t4 = time.perf_counter()
+            dx = lu.solve(residuo) # Resolve sistema linear pelas substituições
+            if observador is not None: # Mesmas fases do caminho iterativo (jacobiana, fatoracao, solucao_linear)
+                observador.add_time("jacobiana", t3 - t2)
+                observador.add_time("fatoracao", t4 - t3)
+                observador.add_time("solucao_linear", time.perf_counter() - t4)
+        else:
+            dx, internas, info, M = _krylov_step(Ybus, V, theta, Vc, S_esp, var_theta, PQ_idx, residuo, linear, jacobiana, eta, M,
+                                                 observador, ordem) # Correção inexata; M é reaproveitado com a Jacobiana livre
+        theta[var_theta] += damping * dx[:n_theta] # Atualiza ângulos
+        V[PQ_idx] += damping * dx[n_theta:] # Atualiza módulos
+        if limites is not None:
+            V[PQ_idx] = np.clip(V[PQ_idx], *limites) # Limita as tensões PQ para o intervalo físico
+    return V * np.exp(1j*theta), it+1, np.max(np.abs(residuo), initial=0) # Retorna tensões, número de iterações e erro final
+
+def _krylov_step(Ybus, V, theta, Vc, S_esp, var_theta, PQ_idx, residuo, linear, jacobiana, eta, M, observador, ordem=None):
+    """Correção de Newton inexata por Krylov; devolve (dx, iterações internas, info do Krylov, pré-condicionador)
+
+    Se o Krylov não converge (info != 0), a correção sai da LU completa da Jacobiana do ponto atual.
+    """
+    def precondicionador():
+        t0 = time.perf_counter()
+        J = build_jacobian(Ybus, Vc, var_theta, PQ_idx) # Jacobiana esparsa (memória linear no tamanho da rede)
+        t1 = time.perf_counter()
+        M = ilu_preconditioner(J) # LU incompleta com preenchimento limitado
+        if observador is not None:
+            observador.add_time("jacobiana", t1 - t0)
+            observador.add_time("fatoracao", time.perf_counter() - t1)
+        return J, M
+    if jacobiana == "esparsa":
+        J, M = precondicionador() # Jacobiana e pré-condicionador do ponto atual
+        A = J
+    else:
+        J = None # Só montada se o pré-condicionador precisar ser refeito
+        A = jacobian_free_operator(Ybus, V, theta, S_esp, var_theta, PQ_idx, residuo) # Produtos J·v sem montar J
+        if M is None:
+            M = precondicionador()[1]
+    t0 = time.perf_counter()
+    dx, internas, info = krylov_solve(A, residuo, M, linear, rtol=eta)
+    if info != 0 and jacobiana == "livre": # Pré-condicionador defasado: remonta no ponto atual e tenta de novo
+        J, M = precondicionador()
+        t0 = time.perf_counter()
+        dx, mais, info = krylov_solve(A, residuo, M, linear, rtol=eta)
+        internas += mais
+    if observador is not None:
+        observador.add_time("solucao_linear", time.perf_counter() - t0)
+    if info != 0: # Krylov não convergiu: correção exata pela LU da Jacobiana do ponto atual
+        t0 = time.perf_counter()
+        lu = factorize(J, ordem)
+        t1 = time.perf_counter()
+        dx = lu.solve(residuo)
+        if observador is not None:
+            observador.add_time("fatoracao", t1 - t0)
+            observador.add_time("solucao_linear", time.perf_counter() - t1)
+    return dx, internas, info, M
+
+def _newton_raphson_laco(Ybus, bus_data, max_iter, tol, damping, V0=None, limites=(0.9, 1.1)):
+    """Motor original: potências e Jacobiana calculadas elemento a elemento"""
+    barras = bus_arrays(bus_data) # Vetores das barras em pu (mesmas entradas do modo esparso)
+    n = len(barras['tipo']) # Número de barras
+    Y = Ybus.toarray() # Acesso elemento a elemento da Ybus esparsa
+    V, theta = initial_voltage(barras, V0) # Módulos especificados e ângulos nulos (ou partida a quente)
+    P = barras['p'] # Vetor de potências ativas líquidas (pu)
+    Q = barras['q'] # Vetor de potências reativas líquidas (pu)
+    tipo = barras['tipo'] # Tipos de barra
+    slack_idx = np.where(tipo == 1)[0][0] # Índice da barra slack
+    PV_idx = np.where(tipo == 2)[0] # Índices das barras PV
+    PQ_idx = np.where(tipo == 0)[0] # Índices das barras PQ
+    var_theta = np.concatenate([PQ_idx, PV_idx]) # Variáveis de ângulo (exceto slack)
+    var_V = PQ_idx # Variáveis de módulo (apenas PQ)
+    n_theta = len(var_theta) # Número de variáveis de ângulo
+    n_V = len(var_V) # Número de variáveis de módulo
+    for it in range(max_iter): # Loop de iterações
+        P_calc = np.zeros(n) # Potências ativas calculadas
+        Q_calc = np.zeros(n) # Potências reativas calculadas
+        for i in range(n):
+            for k in range(n):
+                P_calc[i] += V[i]*V[k]*(Y[i,k].real*np.cos(theta[i]-theta[k]) + Y[i,k].imag*np.sin(theta[i]-theta[k])) # Calcula P
+                Q_calc[i] += V[i]*V[k]*(Y[i,k].real*np.sin(theta[i]-theta[k]) - Y[i,k].imag*np.cos(theta[i]-theta[k])) # Calcula Q
+        dP = P[np.concatenate([PQ_idx, PV_idx])] - P_calc[np.concatenate([PQ_idx, PV_idx])] # Mismatch de P
+        dQ = Q[PQ_idx] - Q_calc[PQ_idx] # Mismatch de Q
+        mismatch = np.concatenate([dP, dQ]) # Vetor de mismatches
+        if np.max(np.abs(mismatch), initial=0) < tol: # Critério de convergência
+            break
+        # Jacobiana
+        J = np.zeros((n_theta + n_V, n_theta + n_V)) # Inicializa Jacobiana
+        # dP/dTheta e dP/dV
+        for i, idx_i in enumerate(var_theta):
+            for j, idx_j in enumerate(var_theta):
+                if idx_i == idx_j:
+                    J[i, j] = -Q_calc[idx_i] - V[idx_i]**2 * Y[idx_i, idx_i].imag # Derivada diagonal
+                else:
+                    J[i, j] = V[idx_i]*V[idx_j]*(Y[idx_i, idx_j].real*np.sin(theta[idx_i]-theta[idx_j]) - Y[idx_i, idx_j].imag*np.cos(theta[idx_i]-theta[idx_j])) # Derivada fora da diagonal
+        for i, idx_i in enumerate(var_theta):
+            for j, idx_j in enumerate(var_V):
+                if idx_i == idx_j:
+                    J[i, n_theta + j] = P_calc[idx_i]/V[idx_i] + V[idx_i]*Y[idx_i, idx_i].real # Derivada diagonal
+                else:
+                    J[i, n_theta + j] = V[idx_i]*(Y[idx_i, idx_j].real*np.cos(theta[idx_i]-theta[idx_j]) + Y[idx_i, idx_j].imag*np.sin(theta[idx_i]-theta[idx_j])) # Derivada fora da diagonal
+        # dQ/dTheta e dQ/dV
+        for i, idx_i in enumerate(var_V):
+            for j, idx_j in enumerate(var_theta):
+                if idx_i == idx_j:
+                    J[n_theta + i, j] = P_calc[idx_i] - V[idx_i]**2 * Y[idx_i, idx_i].real # Derivada diagonal
+                else:
+                    J[n_theta + i, j] = -V[idx_i]*V[idx_j]*(Y[idx_i, idx_j].real*np.cos(theta[idx_i]-theta[idx_j]) + Y[idx_i, idx_j].imag*np.sin(theta[idx_i]-theta[idx_j])) # Derivada fora da diagonal
+        for i, idx_i in enumerate(var_V):
+            for j, idx_j in enumerate(var_V):
+                if idx_i == idx_j:
+                    J[n_theta + i, n_theta + j] = Q_calc[idx_i]/V[idx_i] - V[idx_i]*Y[idx_i, idx_i].imag # Derivada diagonal
+                else:
+                    J[n_theta + i, n_theta + j] = V[idx_i]*(Y[idx_i, idx_j].real*np.sin(theta[idx_i]-theta[idx_j]) - Y[idx_i, idx_j].imag*np.cos(theta[idx_i]-theta[idx_j])) # Derivada fora da diagonal
+        dx = np.linalg.solve(J, mismatch) # Resolve sistema linear
+        # Fator de relaxação para evitar saltos grandes
+        theta[var_theta] += damping * dx[:n_theta] # Atualiza ângulos
+        V[var_V] += damping * dx[n_theta:] # Atualiza módulos
+        # Limita as tensões PQ para o intervalo físico
+        if limites is not None:
+            V[var_V] = np.clip(V[var_V], *limites)
+    return V * np.exp(1j*theta), it+1, np.max(np.abs(mismatch), initial=0) # Retorna tensões, número de iterações e erro final
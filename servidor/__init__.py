@@ -0,0 +1 @@
+"""Servidor local de fluxo de carga: casos compilados mantidos em memória entre pedidos"""
@@ -0,0 +1,87 @@
+import os  # Importa o módulo os para consultar as planilhas
+import threading  # Importa o módulo threading para proteger o cache entre trabalhadores
+from collections import OrderedDict  # Dicionário ordenado pelo uso mais recente
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from scipy import sparse  # Importa o módulo de matrizes esparsas do SciPy
+from comum.caso import load_case  # Carregamento do caso compilado
+
+def memory_size(obj):
+    """Memória aproximada (bytes) de vetores, matrizes esparsas, fatorações LU e contêineres deles"""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if sparse.issparse(obj):
+        return sum(getattr(obj, a).nbytes for a in ('data', 'indices', 'indptr') if hasattr(obj, a))
+    if hasattr(obj, 'L') and hasattr(obj, 'U'):  # Fatoração SuperLU: valores e índices de L e U
+        return (obj.L.nnz + obj.U.nnz) * 12
+    if isinstance(obj, dict):
+        return sum(memory_size(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(memory_size(v) for v in obj)
+    return 0
+
+class CaseCache:
+    """Casos compilados (barras, ramos, Ybus), fatorações e soluções base, com descarte LRU por memória
+
+    Cada entrada é um dicionário com 'caso', 'fatores' (por chave), 'V' (solução base por método) e 'lock'.
+    Uma entrada é recarregada quando a data de modificação de alguma planilha muda. Quando a soma estimada
+    passa de memoria_max bytes, os casos usados há mais tempo são descartados (o mais recente sempre fica).
+    """
+
+    def __init__(self, memoria_max=1 << 30):
+        self.memoria_max = memoria_max
+        self._entradas = OrderedDict()  # Chave -> entrada, da menos para a mais recente
+        self._lock = threading.Lock()
+        self._carregando = {}  # Chave -> lock de carga (evita carregar o mesmo caso duas vezes)
+        self.acertos = self.faltas = self.descartes = 0
+
+    def get(self, barras_path, impedancias_path):
+        """Entrada do caso, carregando-o (load_case, com o cache .npz em disco) se ausente ou desatualizado"""
+        chave = (os.path.abspath(barras_path), os.path.abspath(impedancias_path))
+        mtimes = tuple(os.path.getmtime(f) for f in chave)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada['mtimes'] == mtimes:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return entrada
+            carga = self._carregando.setdefault(chave, threading.Lock())
+        with carga:  # Só um trabalhador compila cada caso
+            with self._lock:
+                entrada = self._entradas.get(chave)
+                if entrada is not None and entrada['mtimes'] == mtimes:
+                    self._entradas.move_to_end(chave)
+                    self.acertos += 1
+                    return entrada
+            entrada = {'chave': chave, 'mtimes': mtimes, 'caso': load_case(*chave), 'fatores': {}, 'V': {},
+                       'lock': threading.Lock()}
+            with self._lock:
+                self.faltas += 1
+                self._entradas[chave] = entrada
+                self._carregando.pop(chave, None)
+            self.update(entrada)
+            return entrada
+
+    def update(self, entrada):
+        """Recalcula a memória da entrada (após guardar fatorações ou soluções) e descarta as menos recentes"""
+        tamanho = memory_size([entrada['caso'], entrada['fatores'], entrada['V']])
+        with self._lock:
+            entrada['tamanho'] = tamanho
+            while len(self._entradas) > 1 and self.memory() > self.memoria_max:
+                self._entradas.popitem(last=False)  # Caso usado há mais tempo
+                self.descartes += 1
+
+    def memory(self):
+        """Memória estimada de todas as entradas (bytes)"""
+        return sum(e.get('tamanho', 0) for e in self._entradas.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'casos': [{'barras': c[0], 'impedancias': c[1], 'memoria_mb': e.get('tamanho', 0) / 2**20}
+                          for c, e in self._entradas.items()],
+                'memoria_mb': self.memory() / 2**20,
+                'memoria_max_mb': self.memoria_max / 2**20,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'descartes': self.descartes,
+            }
@@ -0,0 +1,86 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import json  # Importa o módulo json para o protocolo
+import os  # Importa o módulo os para manipular caminhos
+import socket  # Importa o módulo socket para a conexão
+
+# Sem NumPy/SciPy: o cliente inicia rápido e o trabalho numérico fica no servidor
+ENDERECO_PADRAO = "/tmp/fluxo_de_potencia.sock" if hasattr(socket, "AF_UNIX") else "127.0.0.1:8765"
+
+def parse_address(endereco):
+    """("unix", caminho) ou ("tcp", (host, porta)) a partir de "caminho" ou "host:porta\""""
+    host, _, porta = endereco.rpartition(":")
+    if host and porta.isdigit():
+        return "tcp", (host, int(porta))
+    return "unix", endereco
+
+class SolverClient:
+    """Conexão persistente com o servidor; cada chamada envia um pedido e espera a resposta"""
+
+    def __init__(self, endereco=ENDERECO_PADRAO, timeout=None):
+        familia, destino = parse_address(endereco)
+        self.sock = socket.socket(socket.AF_UNIX if familia == "unix" else socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(destino)
+        self.arquivo = self.sock.makefile("rwb")
+
+    def request(self, op, **campos):
+        """Envia {'op': op, ...} e devolve o resultado; erros do servidor viram RuntimeError"""
+        for chave in ('barras', 'impedancias'):
+            if chave in campos:
+                campos[chave] = os.path.abspath(campos[chave])  # O servidor pode ter outra pasta de trabalho
+        self.arquivo.write((json.dumps(dict(campos, op=op), ensure_ascii=False) + "\n").encode("utf-8"))
+        self.arquivo.flush()
+        linha = self.arquivo.readline()
+        if not linha:
+            raise ConnectionError("O servidor encerrou a conexão")
+        resposta = json.loads(linha)
+        if not resposta['ok']:
+            raise RuntimeError(resposta['erro'])
+        return resposta['resultado']
+
+    def close(self):
+        self.arquivo.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _injections(valores):
+    """["5=12.3", ...] -> {"5": 12.3, ...}"""
+    return {b: float(v) for b, v in (item.split("=", 1) for item in valores)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Cliente do servidor de fluxo de carga")
+    parser.add_argument("op", choices=("carregar", "solve", "resolve", "fluxos", "estado", "encerrar"), help="Operação")
+    parser.add_argument("--endereco", default=ENDERECO_PADRAO, help="Caminho do socket Unix ou host:porta")
+    parser.add_argument("--barras", default="dados_excel/Barras.xlsx", help="Planilha de barras")
+    parser.add_argument("--impedancias", default="dados_excel/impedância.xlsx", help="Planilha de ramos")
+    parser.add_argument("--metodo", default="nr", choices=("nr", "fdlf", "gs"), help="Método de solução")
+    parser.add_argument("--P", nargs="*", default=[], help="Injeções ativas líquidas: barra=MW")
+    parser.add_argument("--Q", nargs="*", default=[], help="Injeções reativas líquidas: barra=MVAr")
+    parser.add_argument("--escala", type=float, default=None, help="Fator das cargas")
+    parser.add_argument("--resumo", action="store_true", help="Só o resumo do relatório de fluxos")
+    args = parser.parse_args()
+
+    campos = {}
+    if args.op not in ("estado", "encerrar"):
+        campos = {'barras': args.barras, 'impedancias': args.impedancias, 'metodo': args.metodo}
+        if args.P:
+            campos['P'] = _injections(args.P)
+        if args.Q:
+            campos['Q'] = _injections(args.Q)
+        if args.escala is not None:
+            campos['escala'] = args.escala
+        if args.resumo:
+            campos['resumo'] = True
+    try:
+        with SolverClient(args.endereco) as cliente:
+            print(json.dumps(cliente.request(args.op, **campos), indent=2, ensure_ascii=False))
+    except (OSError, RuntimeError) as e:
+        print(f"\nErro: {e}")
+
+if __name__ == "__main__":
+    main()
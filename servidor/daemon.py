@@ -0,0 +1,257 @@
+import argparse  # Importa o módulo argparse para a linha de comando
+import json  # Importa o módulo json para o protocolo
+import os  # Importa o módulo os para manipular caminhos
+import socket  # Importa o módulo socket para o tipo de endereço
+import socketserver  # Importa o módulo socketserver para atender as conexões
+import stat  # Importa o módulo stat para reconhecer arquivos de socket
+import threading  # Importa o módulo threading para encerrar o servidor
+import time  # Importa o módulo time para medir os pedidos
+from concurrent.futures import ThreadPoolExecutor  # Pool de trabalhadores dos pedidos
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+from comum.barras import S_BASE  # Potência base do sistema
+from comum.fluxos import calculate_power_flows  # Pós-processamento vetorizado
+from metodo_desacoplado_rapido.fast_decoupled import decoupled_factors, fast_decoupled_power_flow  # Solver desacoplado rápido
+from metodo_gauss_seidel.lib.gauss_seidel import solve_power_flow  # Solver Gauss-Seidel
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+from .cache import CaseCache  # Cache LRU dos casos compilados
+from .cliente import ENDERECO_PADRAO, parse_address  # Endereço do servidor
+
+METODOS = ("nr", "fdlf", "gs")  # Métodos disponíveis
+OPERACOES = ("carregar", "solve", "resolve", "fluxos", "estado", "encerrar")  # Operações do protocolo
+TOLERANCIA = 1e-6  # Tolerância padrão dos solvers
+
+class SolverService:
+    """Executa os pedidos do protocolo sobre o cache de casos
+
+    Cada pedido é um objeto JSON com 'op' e, conforme a operação, 'barras' e 'impedancias' (caminhos das
+    planilhas), 'metodo', 'tol', 'P'/'Q' (injeções líquidas em MW/MVAr por barra, chaves 1-based),
+    'escala' (fator das cargas) e 'resumo'. A resposta traz 'ok' e 'resultado' ou 'erro'.
+    """
+
+    def __init__(self, memoria_max=1 << 30, trabalhadores=None):
+        self.cache = CaseCache(memoria_max)
+        self.pool = ThreadPoolExecutor(trabalhadores or os.cpu_count() or 1)
+        self.pedidos = 0
+
+    def handle(self, pedido):
+        """Resposta (dicionário) a um pedido; erros viram {'ok': False, 'erro': ...}"""
+        inicio = time.perf_counter()
+        try:
+            op = pedido.get('op')
+            if op not in OPERACOES:
+                raise ValueError(f"Operação desconhecida: {op} (use {', '.join(OPERACOES)})")
+            resultado = getattr(self, f"_{op}")(pedido)
+            resposta = {'ok': True, 'resultado': resultado}
+        except Exception as e:
+            resposta = {'ok': False, 'erro': f"{type(e).__name__}: {e}"}
+        self.pedidos += 1
+        resposta['tempo_ms'] = (time.perf_counter() - inicio) * 1000  # Tempo de serviço (sem a rede)
+        if 'id' in pedido:
+            resposta['id'] = pedido['id']
+        return resposta
+
+    def _entrada(self, pedido):
+        return self.cache.get(pedido.get('barras', "dados_excel/Barras.xlsx"),
+                              pedido.get('impedancias', "dados_excel/impedância.xlsx"))
+
+    def _barras(self, entrada, pedido):
+        """Vetores das barras com as alterações do pedido (escala das cargas e injeções P/Q por barra)"""
+        barras = entrada['caso']['barras']
+        if not any(k in pedido for k in ('P', 'Q', 'escala')):
+            return barras
+        barras = dict(barras)
+        escala = float(pedido.get('escala', 1.0))
+        barras['p'] = barras['p'] + (1 - escala) * barras['p_carga']  # Carga escalada, geração mantida
+        barras['q'] = barras['q'] + (1 - escala) * barras['q_carga']
+        barras['p_carga'], barras['q_carga'] = escala * barras['p_carga'], escala * barras['q_carga']
+        for campo, chave in (('p', 'P'), ('q', 'Q')):
+            if chave in pedido:
+                barras[campo] = barras[campo].copy()
+                for barra, valor in pedido[chave].items():
+                    barras[campo][int(barra) - 1] = float(valor) / S_BASE  # Injeção líquida (MW/MVAr -> pu)
+        return barras
+
+    def _fatores(self, entrada):
+        """B' e B'' fatoradas da topologia do caso, guardadas na entrada do cache"""
+        with entrada['lock']:
+            fatores = entrada['fatores'].get('fdlf')
+            if fatores is None:
+                caso = entrada['caso']
+                fatores = entrada['fatores']['fdlf'] = decoupled_factors(caso['ramos'], caso['barras']['tipo'])
+                self.cache.update(entrada)
+        return fatores
+
+    def _solve_case(self, entrada, pedido, V0):
+        metodo = pedido.get('metodo', "nr")
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconhecido: {metodo} (use {', '.join(METODOS)})")
+        caso, tol = entrada['caso'], float(pedido.get('tol', TOLERANCIA))
+        barras = self._barras(entrada, pedido)
+        if metodo == "nr":
+            V, iteracoes, erro = newton_raphson_power_flow(caso['Ybus'], barras, tol=tol, V0=V0)
+        elif metodo == "fdlf":
+            V, iteracoes, erro = fast_decoupled_power_flow(caso['Ybus'], barras, caso['ramos'], tol=tol, V0=V0,
+                                                           fatores=self._fatores(entrada))
+        else:
+            V, iteracoes, erro = solve_power_flow(caso['Ybus'], barras, caso['ramos'], erro_max=tol, V0=V0)[:3]
+        return V, barras, int(iteracoes), float(erro), bool(erro < tol and np.all(np.isfinite(V)))
+
+    def _base(self, entrada, pedido):
+        """Solução do caso base pelo método do pedido, guardada na entrada (ponto de partida dos re-solves)"""
+        metodo = pedido.get('metodo', "nr")
+        V = entrada['V'].get(metodo)
+        if V is None:
+            base = {k: v for k, v in pedido.items() if k not in ('P', 'Q', 'escala')}
+            V, _, _, _, convergiu = self._solve_case(entrada, base, None)
+            if not convergiu:
+                raise RuntimeError("O caso base não convergiu")
+            entrada['V'][metodo] = V
+            self.cache.update(entrada)
+        return V
+
+    @staticmethod
+    def _solution(V, iteracoes, erro, convergiu):
+        return {'V': np.abs(V).tolist(), 'angulo': np.degrees(np.angle(V)).tolist(),
+                'iteracoes': iteracoes, 'erro': erro, 'convergiu': convergiu}
+
+    def _carregar(self, pedido):
+        caso = self._entrada(pedido)['caso']
+        return {'n_barras': len(caso['barras']['tipo']), 'n_ramos': len(caso['ramos']['de'])}
+
+    def _solve(self, pedido):
+        """Fluxo de carga com partida plana (com as alterações do pedido, se houver)"""
+        V, _, iteracoes, erro, convergiu = self._solve_case(self._entrada(pedido), pedido, None)
+        return self._solution(V, iteracoes, erro, convergiu)
+
+    def _resolve(self, pedido):
+        """Fluxo de carga com as alterações do pedido, partindo da solução base em cache"""
+        entrada = self._entrada(pedido)
+        V, _, iteracoes, erro, convergiu = self._solve_case(entrada, pedido, self._base(entrada, pedido))
+        return self._solution(V, iteracoes, erro, convergiu)
+
+    def _fluxos(self, pedido):
+        """Relatório de fluxos (colunas por barra e por ramo, MW/MVAr) ou só o resumo, com 'resumo': true
+
+        P/Q do pedido substituem a injeção líquida da barra, cuja carga passa a ser desconhecida: nessas barras
+        P_gerada/Q_gerada vêm nulas (só P_injetada/Q_injetada valem) e geracao_P/geracao_Q também.
+        """
+        entrada = self._entrada(pedido)
+        caso = entrada['caso']
+        V, barras, iteracoes, erro, convergiu = self._solve_case(entrada, pedido, self._base(entrada, pedido))
+        r = calculate_power_flows(V, caso['Ybus'], barras, caso['ramos'])
+        ramos = caso['ramos']
+        carregamento = np.maximum(np.hypot(r['fluxos_ativos'], r['fluxos_reativos']),
+                                  np.hypot(r['fluxos_ativos_para'], r['fluxos_reativos_para'])) * S_BASE
+        modulo = np.abs(V)
+        alteradas = {c: [int(b) - 1 for b in pedido.get(c, {})] for c in ('P', 'Q')}  # Barras com injeção substituída
+        def geracao(campo, chave):  # Geração por barra (MW/MVAr), nula onde a injeção foi substituída
+            valores = [float(v) for v in r[campo] * S_BASE]
+            for i in alteradas[chave]:
+                valores[i] = None
+            return valores
+        P_gerada, Q_gerada = geracao('P_gerada', 'P'), geracao('Q_gerada', 'Q')
+        resumo = {
+            'iteracoes': iteracoes, 'erro': erro, 'convergiu': convergiu,
+            'V_min': float(modulo.min()), 'barra_V_min': int(np.argmin(modulo)) + 1,
+            'V_max': float(modulo.max()), 'barra_V_max': int(np.argmax(modulo)) + 1,
+            'geracao_P': None if alteradas['P'] else float(np.sum(r['P_gerada']) * S_BASE),
+            'geracao_Q': None if alteradas['Q'] else float(np.sum(r['Q_gerada']) * S_BASE),
+            'perdas_P': float(np.sum(r['perdas_ativas']) * S_BASE), 'perdas_Q': float(np.sum(r['perdas_reativas']) * S_BASE),
+            'sobrecargas': (np.flatnonzero(carregamento > ramos['limite']) + 1).tolist(),
+        }
+        if pedido.get('resumo'):
+            return resumo
+        resumo.update(self._solution(V, iteracoes, erro, convergiu))
+        resumo.update({
+            'P_gerada': P_gerada, 'Q_gerada': Q_gerada,
+            'P_injetada': (r['P_injetada'] * S_BASE).tolist(), 'Q_injetada': (r['Q_injetada'] * S_BASE).tolist(),
+            'P_de': (r['fluxos_ativos'] * S_BASE).tolist(), 'Q_de': (r['fluxos_reativos'] * S_BASE).tolist(),
+            'P_para': (r['fluxos_ativos_para'] * S_BASE).tolist(), 'Q_para': (r['fluxos_reativos_para'] * S_BASE).tolist(),
+            'perdas_ativas': (r['perdas_ativas'] * S_BASE).tolist(), 'perdas_reativas': (r['perdas_reativas'] * S_BASE).tolist(),
+            'carregamento': carregamento.tolist(),
+        })
+        return resumo
+
+    def _estado(self, pedido):
+        return dict(self.cache.stats(), pedidos=self.pedidos)
+
+    def _encerrar(self, pedido):
+        return {'encerrando': True}
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Uma conexão: um pedido JSON por linha, uma resposta JSON por linha, na mesma ordem"""
+
+    def handle(self):
+        servico = self.server.servico
+        for linha in self.rfile:
+            if not linha.strip():
+                continue
+            try:
+                pedido = json.loads(linha)
+            except json.JSONDecodeError as e:
+                pedido, resposta = {}, {'ok': False, 'erro': f"JSON inválido: {e}"}
+            else:
+                resposta = servico.pool.submit(servico.handle, pedido).result()  # Trabalhador do pool
+            self.wfile.write((json.dumps(resposta, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if pedido.get('op') == "encerrar" and resposta['ok']:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+if hasattr(socket, "AF_UNIX"):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+def _remove_stale_socket(destino):
+    """Remove o socket abandonado por uma execução anterior; recusa outros arquivos e servidores ativos"""
+    if not os.path.lexists(destino):
+        return
+    if not stat.S_ISSOCK(os.lstat(destino).st_mode):
+        raise FileExistsError(f"{destino} já existe e não é um socket")
+    teste = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        teste.connect(destino)
+    except OSError:  # Ninguém atende: socket de uma execução encerrada
+        os.unlink(destino)
+    else:
+        raise RuntimeError(f"Já há um servidor atendendo em {destino}")
+    finally:
+        teste.close()
+
+def serve(endereco=ENDERECO_PADRAO, memoria_max=1 << 30, trabalhadores=None, pronto=None):
+    """Atende pedidos em `endereco` ("host:porta" ou caminho de socket Unix) até receber 'encerrar'"""
+    familia, destino = parse_address(endereco)
+    if familia == "unix":
+        _remove_stale_socket(destino)
+        servidor = _UnixServer(destino, _Handler)
+    else:
+        servidor = _TCPServer(destino, _Handler)
+    servidor.servico = SolverService(memoria_max, trabalhadores)
+    try:
+        if pronto is not None:
+            pronto(servidor)
+        servidor.serve_forever()
+    finally:
+        servidor.server_close()
+        servidor.servico.pool.shutdown()
+        if familia == "unix" and os.path.exists(destino):
+            os.unlink(destino)
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de fluxo de carga (protocolo JSON por linha)")
+    parser.add_argument("--endereco", default=ENDERECO_PADRAO, help="Caminho do socket Unix ou host:porta")
+    parser.add_argument("--memoria", type=float, default=1024, help="Memória máxima do cache de casos (MB)")
+    parser.add_argument("--trabalhadores", type=int, default=None, help="Pedidos atendidos em paralelo (padrão: núcleos)")
+    args = parser.parse_args()
+    print(f"Servidor de fluxo de carga em {args.endereco} (cache de {args.memoria:.0f} MB)")
+    try:
+        serve(args.endereco, int(args.memoria * 2**20), args.trabalhadores)
+    except (FileExistsError, RuntimeError) as e:
+        print(f"\nErro: {e}")
+
+if __name__ == "__main__":
+    main()
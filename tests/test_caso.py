@@ -0,0 +1,46 @@
+import os  # Importa o módulo os para alterar datas de modificação
+import shutil  # Importa o módulo shutil para copiar as planilhas
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa o pandas para modificar uma planilha
+import pytest  # Importa o pytest para fixtures
+from comum import caso as modulo_caso  # Módulo do cache (para detectar o caminho frio)
+from comum.caso import load_case  # Carregamento do caso compilado
+
+@pytest.fixture
+def planilhas(tmp_path, monkeypatch):
+    """Cópias das planilhas numa pasta temporária e contador de leituras do Excel"""
+    for nome in ("Barras.xlsx", "impedância.xlsx"):
+        shutil.copy(os.path.join("dados_excel", nome), tmp_path / nome)
+    leituras = []
+    parse = modulo_caso._parse_excel
+    monkeypatch.setattr(modulo_caso, "_parse_excel", lambda *a, **k: leituras.append(a) or parse(*a, **k))
+    return str(tmp_path / "Barras.xlsx"), str(tmp_path / "impedância.xlsx"), leituras
+
+def test_cache_reaproveitado(planilhas):
+    barras, impedancias, leituras = planilhas
+    primeiro = load_case(barras, impedancias)
+    assert len(leituras) == 1 and os.listdir(os.path.join(os.path.dirname(barras), ".cache"))
+    segundo = load_case(barras, impedancias)
+    assert len(leituras) == 1  # Caminho quente: o Excel não é lido de novo
+    assert (primeiro['Ybus'] != segundo['Ybus']).nnz == 0
+    np.testing.assert_array_equal(primeiro['barras']['p'], segundo['barras']['p'])
+
+def test_data_nova_com_mesmo_conteudo(planilhas):
+    barras, impedancias, leituras = planilhas
+    load_case(barras, impedancias)
+    os.utime(impedancias, (os.path.getatime(impedancias), os.path.getmtime(impedancias) + 10))
+    load_case(barras, impedancias)
+    load_case(barras, impedancias)
+    assert len(leituras) == 1  # O hash confirma o conteúdo e as datas registradas são atualizadas
+
+def test_conteudo_alterado_invalida(planilhas):
+    barras, impedancias, leituras = planilhas
+    antes = load_case(barras, impedancias)
+    tabela = pd.read_excel(impedancias)
+    tabela.loc[0, "REATÂNCIA"] *= 2  # Dobra a reatância do ramo 1-2
+    tabela.to_excel(impedancias, index=False)
+    os.utime(impedancias, (os.path.getatime(impedancias), os.path.getmtime(impedancias) + 10))
+    depois = load_case(barras, impedancias)
+    assert len(leituras) == 2
+    assert depois['ramos']['x'][0] == pytest.approx(2 * antes['ramos']['x'][0])
+    assert depois['Ybus'][0, 1] != antes['Ybus'][0, 1]
@@ -0,0 +1,15 @@
+import pytest  # Importa o pytest para parametrizar os casos
+from benchmark.gerador import synthetic_grid  # Redes sintéticas reprodutíveis
+from comum.barras import bus_arrays  # Extração dos vetores das barras
+from comum.ybus import branch_arrays, build_ybus  # Vetores dos ramos e Ybus esparsa
+from metodo_gauss_seidel.lib.gauss_seidel import solve_power_flow  # Solver Gauss-Seidel
+
+@pytest.mark.parametrize("n, topologia, semente", [(118, "malhada", 0), (300, "radial", 1), (1000, "radial", 1)])
+def test_aceleracao_adaptativa_nao_perde_para_gs_puro(n, topologia, semente):
+    barras_tab, impedancias_tab = synthetic_grid(n, topologia, semente)
+    barras, ramos = bus_arrays(barras_tab), branch_arrays(impedancias_tab)
+    Y = build_ybus(ramos, n)
+    _, k_adaptativo, erro = solve_power_flow(Y, barras, ramos, K_max=50000)
+    _, k_puro, _ = solve_power_flow(Y, barras, ramos, K_max=50000, aceleracao=1.0)
+    assert erro <= 1e-6
+    assert k_adaptativo <= k_puro  # O ajuste automático nunca deve ser pior que ω = 1
@@ -0,0 +1,38 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pytest  # Importa o pytest para parametrizar os métodos
+from analises.ilhas import METODOS, solve_islands  # Solução por ilha
+from benchmark.gerador import synthetic_grid  # Redes sintéticas reprodutíveis
+from comum.barras import bus_arrays  # Extração dos vetores das barras
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.topologia import ORDENACOES  # Ordenações de barras disponíveis
+from comum.ybus import branch_arrays, build_ybus  # Vetores dos ramos e montagem da Ybus
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+@pytest.fixture(scope="module")
+def caso_7_8_aberto():
+    """IEEE14 com o ramo 7-8 aberto: a barra PV 8 fica sozinha e vira slack da própria ilha"""
+    caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx")
+    ramos = caso['ramos']
+    sel = ~((ramos['de'] == 6) & (ramos['para'] == 7))
+    ramos = {k: v[sel] for k, v in ramos.items()}
+    return build_ybus(ramos, len(caso['barras']['tipo'])), caso['barras'], ramos
+
+@pytest.mark.parametrize("metodo", METODOS)
+def test_ilha_so_com_slack(caso_7_8_aberto, metodo):
+    Ybus, barras, ramos = caso_7_8_aberto
+    V, _, erro, topologia = solve_islands(Ybus, barras, ramos, metodo)
+    assert erro < 1e-6
+    assert topologia['tipo'][7] == 1  # Barra 8 é a referência da sua ilha
+    assert V[7] == pytest.approx(barras['v'][7])  # Tensão especificada, ângulo nulo
+    assert np.all(np.abs(V) > 0.9)  # As duas ilhas estão energizadas
+
+@pytest.mark.parametrize("ordenacao", ORDENACOES)
+@pytest.mark.parametrize("metodo", ["nr", "fdlf"])
+def test_ordenacao_chega_a_fatoracao(metodo, ordenacao):
+    barras_tab, impedancias_tab = synthetic_grid(300, "malhada", 0)
+    barras, ramos = bus_arrays(barras_tab), branch_arrays(impedancias_tab)
+    Ybus = build_ybus(ramos, 300)
+    referencia, _, _ = newton_raphson_power_flow(Ybus, barras, tol=1e-10)
+    V, _, erro, _ = solve_islands(Ybus, barras, ramos, metodo, ordenacao=ordenacao, tol=1e-10)
+    assert erro < 1e-10
+    np.testing.assert_allclose(V, referencia, atol=1e-8)
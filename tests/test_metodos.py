@@ -0,0 +1,33 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pytest  # Importa o pytest para fixtures e parametrização
+from comum.caso import load_case  # Carregamento do caso compilado
+from metodo_desacoplado_rapido.fast_decoupled import fast_decoupled_power_flow  # Solver desacoplado rápido
+from metodo_gauss_seidel.lib.gauss_seidel import solve_power_flow  # Solver Gauss-Seidel
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+@pytest.fixture(scope="module")
+def ieee14():
+    """Caso IEEE14 e a solução de referência do Newton-Raphson esparso"""
+    caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx")
+    V, _, erro = newton_raphson_power_flow(caso['Ybus'], caso['barras'], tol=1e-10)
+    assert erro < 1e-10
+    return caso, V
+
+def test_nr_esparso_igual_ao_laco(ieee14):
+    caso, V = ieee14
+    V_laco, _, erro = newton_raphson_power_flow(caso['Ybus'], caso['barras'], tol=1e-10, modo="laco")
+    assert erro < 1e-10
+    np.testing.assert_allclose(V_laco, V, atol=1e-8)
+
+@pytest.mark.parametrize("variante", ["XB", "BX"])
+def test_fdlf_converge_para_nr(ieee14, variante):
+    caso, V = ieee14
+    V_fdlf, _, erro = fast_decoupled_power_flow(caso['Ybus'], caso['barras'], caso['ramos'], tol=1e-9, variante=variante)
+    assert erro < 1e-9
+    np.testing.assert_allclose(V_fdlf, V, atol=1e-7)
+
+def test_gs_converge_para_nr(ieee14):  # Só o motor esparso: o laço original mantém os fatores e1/e2
+    caso, V = ieee14
+    V_gs, _, erro = solve_power_flow(caso['Ybus'], caso['barras'], caso['ramos'], erro_max=1e-9, K_max=5000)
+    assert erro < 1e-9
+    np.testing.assert_allclose(V_gs, V, atol=1e-6)
@@ -0,0 +1,20 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pytest  # Importa o pytest para parametrizar os formatos
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.fluxos import calculate_power_flows  # Pós-processamento vetorizado
+from comum.saida import ResultWriter, read_results  # Conjunto de dados em colunas
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+
+@pytest.mark.parametrize("formato", ["npz", "csv"])
+def test_sessoes_continuam_os_instantes(tmp_path, formato):
+    caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx")
+    V, _, _ = newton_raphson_power_flow(caso['Ybus'], caso['barras'])
+    resultados = calculate_power_flows(V, caso['Ybus'], caso['barras'], caso['ramos'])
+    for _ in range(3):  # Três execuções gravando dois instantes cada na mesma pasta
+        with ResultWriter(str(tmp_path), caso['ramos'], formato) as escritor:
+            escritor.append(resultados)
+            escritor.append(resultados)
+    barras = read_results(str(tmp_path))
+    assert np.array_equal(np.unique(barras['instante']), np.arange(6))
+    assert len(barras['instante']) == 6 * len(V)  # Nenhuma linha (instante, barra) repetida
+    np.testing.assert_allclose(barras['P_injetada'][:len(V)], resultados['P_injetada'] * 100, atol=1e-3)
@@ -0,0 +1,41 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pytest  # Importa o pytest para fixtures e parametrização
+from analises.sensibilidades import dc_power_flow, screen_injections, screen_outages, sensitivity_matrices  # Fluxo CC e PTDF/LODF
+from comum.caso import load_case  # Carregamento do caso compilado
+
+@pytest.fixture(scope="module")
+def caso_cc():
+    """Caso IEEE14, matrizes de sensibilidade e fluxos CC do caso base"""
+    caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx")
+    sens = sensitivity_matrices(caso['ramos'], caso['barras']['tipo'])
+    _, fluxos = dc_power_flow(caso['ramos'], caso['barras'])
+    return caso, sens, fluxos
+
+@pytest.mark.parametrize("barra", [1, 8, 13])
+def test_ptdf_igual_a_novo_fluxo_cc(caso_cc, barra):
+    caso, sens, fluxos = caso_cc
+    dP = np.zeros(len(caso['barras']['tipo']))
+    dP[barra] = 0.3  # Injeção extra na barra, retirada na slack
+    barras = dict(caso['barras'], p=caso['barras']['p'] + dP)
+    _, esperado = dc_power_flow(caso['ramos'], barras)
+    np.testing.assert_allclose(screen_injections(sens, fluxos, dP)[:, 0], esperado, atol=1e-10)
+
+def test_lodf_igual_a_novo_fluxo_cc(caso_cc):
+    caso, sens, fluxos = caso_cc
+    ramos = caso['ramos']
+    pos = screen_outages(sens, fluxos)
+    testados = 0
+    for k in np.flatnonzero(~sens['ilhamento']):
+        sel = np.arange(len(ramos['de'])) != k
+        _, esperado = dc_power_flow({c: v[sel] for c, v in ramos.items()}, caso['barras'])
+        np.testing.assert_allclose(pos[sel, k], esperado, atol=1e-10)
+        assert pos[k, k] == 0  # Ramo desligado
+        testados += 1
+    assert testados > 0
+
+def test_ilhamento_marcado(caso_cc):
+    caso, sens, _ = caso_cc
+    ramos = caso['ramos']
+    radial = (ramos['de'] == 6) & (ramos['para'] == 7)  # Ramo 7-8: única ligação da barra 8
+    assert sens['ilhamento'][radial].all()
+    assert np.isnan(sens['lodf'][:, radial]).all()
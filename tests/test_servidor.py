@@ -0,0 +1,72 @@
+import os  # Importa o módulo os para manipular caminhos
+import socket  # Importa o módulo socket para criar um socket abandonado
+import threading  # Importa o módulo threading para rodar o servidor em segundo plano
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pytest  # Importa o pytest para fixtures e exceções esperadas
+from comum.caso import load_case  # Carregamento do caso compilado
+from metodo_newton_raphson.newton_raphson import newton_raphson_power_flow  # Solver Newton-Raphson
+from servidor.cliente import SolverClient  # Cliente do protocolo
+from servidor.daemon import serve  # Servidor local
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Exige sockets Unix")
+
+BARRAS, IMPEDANCIAS = "dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx"
+
+@pytest.fixture
+def endereco(tmp_path):
+    """Servidor em segundo plano num socket temporário; encerrado ao fim do teste"""
+    caminho = str(tmp_path / "fluxo.sock")
+    pronto = threading.Event()
+    tarefa = threading.Thread(target=serve, args=(caminho,), kwargs={'trabalhadores': 2, 'pronto': lambda s: pronto.set()})
+    tarefa.start()
+    assert pronto.wait(10)
+    yield caminho
+    with SolverClient(caminho) as cliente:
+        cliente.request("encerrar")
+    tarefa.join(10)
+    assert not os.path.exists(caminho)
+
+def test_ida_e_volta(endereco):
+    caso = load_case(BARRAS, IMPEDANCIAS)
+    V, _, _ = newton_raphson_power_flow(caso['Ybus'], caso['barras'])
+    with SolverClient(endereco) as cliente:
+        assert cliente.request("carregar", barras=BARRAS, impedancias=IMPEDANCIAS) == {'n_barras': 14, 'n_ramos': 20}
+        resultado = cliente.request("resolve", barras=BARRAS, impedancias=IMPEDANCIAS)
+        assert resultado['convergiu']
+        np.testing.assert_allclose(resultado['V'], np.abs(V), atol=1e-6)
+        estado = cliente.request("estado")
+        assert len(estado['casos']) == 1 and estado['acertos'] >= 1  # Caso carregado uma vez e reaproveitado
+
+def test_injecao_substituida_nao_vira_geracao(endereco):
+    with SolverClient(endereco) as cliente:
+        r = cliente.request("fluxos", barras=BARRAS, impedancias=IMPEDANCIAS, P={"14": -40})
+    assert r['convergiu']
+    assert r['P_injetada'][13] == pytest.approx(-40, abs=1e-3)
+    assert r['P_gerada'][13] is None and r['geracao_P'] is None  # Carga da barra 14 desconhecida
+    assert r['P_gerada'][2] == pytest.approx(0, abs=1e-3)  # Barra de carga sem alteração: geração nula
+
+def test_nao_apaga_arquivo_comum(tmp_path):
+    caminho = tmp_path / "dados.txt"
+    caminho.write_text("não apagar")
+    with pytest.raises(FileExistsError):
+        serve(str(caminho))
+    assert caminho.read_text() == "não apagar"
+
+def test_nao_substitui_servidor_ativo(endereco):
+    with pytest.raises(RuntimeError):
+        serve(endereco)
+    with SolverClient(endereco) as cliente:  # O servidor original continua atendendo
+        assert cliente.request("estado")['pedidos'] >= 0
+
+def test_remove_socket_abandonado(tmp_path):
+    caminho = str(tmp_path / "velho.sock")
+    velho = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    velho.bind(caminho)
+    velho.close()  # O arquivo fica, sem ninguém atendendo
+    pronto = threading.Event()
+    tarefa = threading.Thread(target=serve, args=(caminho,), kwargs={'pronto': lambda s: pronto.set()})
+    tarefa.start()
+    assert pronto.wait(10)
+    with SolverClient(caminho) as cliente:
+        cliente.request("encerrar")
+    tarefa.join(10)
@@ -0,0 +1,33 @@
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa o pandas para ler a matriz antiga
+from comum.caso import load_case  # Carregamento do caso compilado
+from comum.ybus import build_ybus  # Montagem da Ybus
+
+def _matriz_antiga():
+    """Matriz Admitância.xlsx (texto como "6,0296-19,5042i") convertida para complexos"""
+    tabela = pd.read_excel("dados_excel/Matriz Admitância.xlsx", index_col=0)
+    return np.array([[complex(str(y).replace(",", ".").replace("i", "j")) for y in linha] for linha in tabela.values])
+
+def test_ybus_reproduz_matriz_antiga():
+    caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx")
+    ramos = dict(caso['ramos'], b_meia=np.zeros(len(caso['ramos']['de'])))  # A matriz antiga não tinha carregamento
+    Y = build_ybus(ramos, 14).toarray()
+    antiga = _matriz_antiga()
+    assert antiga[8, 9] == 0 and abs(Y[8, 9]) > 1  # Ramo 9-10 ausente da matriz antiga (só Y10-9 existia)
+    Y[8, 9] = 0
+    # Nas barras dos transformadores (4-7, 4-9, 5-6) a matriz antiga usava ys/tap nos dois lados;
+    # o modelo π usa ys/tap² no lado do tap e ys no outro
+    trafos = np.zeros(14, dtype=bool)
+    trafos[[3, 4, 5, 6, 8]] = True
+    comparar = ~np.diag(trafos)
+    np.testing.assert_allclose(Y[comparar], antiga[comparar], atol=1e-3)
+
+def test_carregamento_so_na_diagonal():
+    caso = load_case("dados_excel/Barras.xlsx", "dados_excel/impedância.xlsx")
+    ramos = caso['ramos']
+    sem_carregamento = build_ybus(dict(ramos, b_meia=np.zeros(len(ramos['de']))), 14).toarray()
+    diferenca = caso['Ybus'].toarray() - sem_carregamento
+    esperado = np.zeros(14)
+    np.add.at(esperado, ramos['de'], ramos['b_meia'] / ramos['tap'] ** 2)
+    np.add.at(esperado, ramos['para'], ramos['b_meia'])
+    np.testing.assert_allclose(diferenca, np.diag(1j * esperado), atol=1e-12)